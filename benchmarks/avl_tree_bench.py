@@ -0,0 +1,141 @@
+# benchmarks/avl_tree_bench.py
+# Run from the repository root: python -m benchmarks.avl_tree_bench [--sizes 10000 100000 1000000]
+import argparse
+import gc
+import random
+import sys
+import time
+from modules.avl_tree import insert_avl, build_avl_from_sorted, range_query_avl
+from modules.product import Product
+from modules.sorting import compute_rating_price_score
+
+class LegacyNode:
+    def __init__(self, product):
+        self.product = product
+        self.left = None
+        self.right = None
+        self.height = 1
+
+def legacy_height(node):
+    return node.height if node else 0
+
+def legacy_update(node):
+    node.height = max(legacy_height(node.left), legacy_height(node.right)) + 1
+
+def legacy_left_rotate(y):
+    x = y.right
+    y.right = x.left
+    x.left = y
+    legacy_update(y)
+    legacy_update(x)
+    return x
+
+def legacy_right_rotate(x):
+    y = x.left
+    x.left = y.right
+    y.right = x
+    legacy_update(x)
+    legacy_update(y)
+    return y
+
+def legacy_insert(root, product):
+    # The original recursive insert, which also dropped equal prices.
+    if not root:
+        return LegacyNode(product)
+    if product.price < root.product.price:
+        root.left = legacy_insert(root.left, product)
+    elif product.price > root.product.price:
+        root.right = legacy_insert(root.right, product)
+    else:
+        return root
+    legacy_update(root)
+    balance = legacy_height(root.left) - legacy_height(root.right)
+    if balance > 1 and product.price < root.left.product.price:
+        return legacy_right_rotate(root)
+    if balance < -1 and product.price > root.right.product.price:
+        return legacy_left_rotate(root)
+    if balance > 1 and product.price > root.left.product.price:
+        root.left = legacy_left_rotate(root.left)
+        return legacy_right_rotate(root)
+    if balance < -1 and product.price < root.right.product.price:
+        root.right = legacy_right_rotate(root.right)
+        return legacy_left_rotate(root)
+    return root
+
+def legacy_range_query(node, min_price, max_price, results):
+    if not node:
+        return
+    if min_price < node.product.price:
+        legacy_range_query(node.left, min_price, max_price, results)
+    if min_price <= node.product.price <= max_price:
+        results.append(node.product)
+    if max_price > node.product.price:
+        legacy_range_query(node.right, min_price, max_price, results)
+
+def make_products(n, seed=42):
+    rng = random.Random(seed)
+    return [
+        Product(f"Product {i}", rng.randint(100, 10 * n), "N/A", f"{rng.uniform(1, 5):.1f}", "N/A", "Bench")
+        for i in range(n)
+    ]
+
+def timed(fn):
+    # Like timeit, keep the cyclic GC out of the measurement; it dominates at a million nodes.
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        result = fn()
+        return result, time.perf_counter() - start
+    finally:
+        gc.enable()
+
+def build_legacy(products):
+    root = None
+    for product in products:
+        root = legacy_insert(root, product)
+    return root
+
+def build_iterative(products, scores):
+    root = None
+    for product, score in zip(products, scores):
+        root = insert_avl(root, product, score)
+    return root
+
+def run_queries(query, root, ranges):
+    for lo, hi in ranges:
+        query(root, lo, hi, [])
+
+def bench(n, queries):
+    products = make_products(n)
+    rng = random.Random(7)
+    ranges = []
+    for _ in range(queries):
+        lo = rng.randint(100, 10 * n)
+        ranges.append((lo, lo + n // 100))
+    legacy_root, legacy_build = timed(lambda: build_legacy(products))
+    # Scores are computed up front so both new builds time only tree work, like the legacy one.
+    scores = [compute_rating_price_score(p) for p in products]
+    root, iterative_build = timed(lambda: build_iterative(products, scores))
+    order, sort_time = timed(lambda: sorted(range(n), key=lambda i: products[i].price))
+    bulk_root, bulk_build = timed(
+        lambda: build_avl_from_sorted([products[i] for i in order], [scores[i] for i in order])
+    )
+    _, legacy_query = timed(lambda: run_queries(legacy_range_query, legacy_root, ranges))
+    _, iterative_query = timed(lambda: run_queries(range_query_avl, root, ranges))
+    print(f"n={n:>9,}  recursive insert {legacy_build:7.2f}s | iterative insert {iterative_build:7.2f}s | "
+          f"sort+bulk load {sort_time + bulk_build:6.2f}s")
+    print(f"{'':13}{queries} range queries: recursive {legacy_query * 1000:8.1f}ms | "
+          f"iterative {iterative_query * 1000:8.1f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the recursive and iterative AVL price index.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+    sys.setrecursionlimit(10_000)
+    for n in args.sizes:
+        bench(n, args.queries)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+# benchmarks/fixtures.py
+# Search-result pages and catalogs for the offline benchmarks.
+# Record live pages once with: python -m benchmarks.fixtures --record DIR --query "running shoes"
+# Saved pages are named <site>.html; any site without one gets a generated page in its current layout.
+import argparse
+import json
+import os
+import random
+from html import escape
+from modules.product import Product
+
+SITES = ("amazon", "myntra", "snapdeal", "shopclues", "flipkart")
+
+BRANDS = ["Nike", "Puma", "Adidas", "Campus", "Bata", "Sparx", "Skechers", "Reebok", "Asics", "Woodland"]
+NOUNS = ["Running Shoes", "Sneakers", "Walking Shoes", "Sports Shoes", "Trail Runners", "Casual Shoes"]
+
+def make_item(rng, i):
+    price = rng.randint(199, 9999)
+    return {
+        "name": f"{rng.choice(BRANDS)} Men's {rng.choice(NOUNS)} Model {i}",
+        "price": price,
+        "mrp": price + rng.choice([0, rng.randint(50, 5000)]),
+        "rating": round(rng.uniform(2.5, 5.0), 1) if rng.random() > 0.15 else None,
+        "id": f"{rng.randrange(16 ** 10):010X}"
+    }
+
+def page_chrome(body):
+    # Real result pages are mostly navigation, scripts and footers around the product grid.
+    filler = "".join(
+        f'<div class="nav-item"><a href="/category/{i}">Category {i}</a><script>var x{i} = {i};</script></div>'
+        for i in range(200)
+    )
+    return f"<html><head><title>Search</title></head><body><header>{filler}</header>{body}<footer>{filler}</footer></body></html>"
+
+def render_amazon(items):
+    cards = []
+    for item in items:
+        strike = (f'<span class="a-price a-text-price"><span class="a-offscreen">₹{item["mrp"]:,}</span></span>'
+                  if item["mrp"] > item["price"] else "")
+        rating = (f'<span class="a-icon-alt">{item["rating"]} out of 5 stars</span>' if item["rating"] else "")
+        cards.append(
+            f'<div data-component-type="s-search-result" data-asin="{item["id"]}">'
+            f'<a class="a-link-normal s-no-outline" href="/dp/{item["id"]}"><img src="x.jpg"></a>'
+            f'<h2><span>{escape(item["name"])}</span></h2>'
+            f'<span class="a-price"><span class="a-price-whole">{item["price"]:,}</span></span>{strike}{rating}</div>'
+        )
+    return page_chrome("".join(cards))
+
+def render_myntra(items):
+    # Myntra ships its results twice: as the window.__myx state blob and as server-rendered cards.
+    state = {"searchData": {"results": {"products": [
+        {"productName": item["name"], "landingPageUrl": f"shoes/{item['id']}/buy", "price": item["price"],
+         "mrp": item["mrp"], "rating": item["rating"] or 0}
+        for item in items
+    ]}}}
+    cards = "".join(
+        f'<li class="product-base"><a href="shoes/{item["id"]}/buy">'
+        f'<h4 class="product-product">{escape(item["name"])}</h4>'
+        f'<span class="product-discountedPrice">Rs. {item["price"]}</span>'
+        f'<span class="product-strike">Rs. {item["mrp"]}</span></a>'
+        + (f'<div class="product-ratingsContainer"><span>{item["rating"]}</span></div>' if item["rating"] else "")
+        + "</li>"
+        for item in items
+    )
+    return page_chrome(f'<ul class="results-base">{cards}</ul><script>window.__myx = {json.dumps(state)};</script>')
+
+def render_snapdeal(items):
+    return page_chrome("".join(
+        f'<div class="product-tuple-listing js-tuple"><a href="https://www.snapdeal.com/product/{item["id"]}">'
+        f'<p class="product-title">{escape(item["name"])}</p></a>'
+        f'<span class="lfloat product-price">Rs. {item["price"]}</span>'
+        f'<span class="lfloat product-desc-price strike">Rs. {item["mrp"]}</span>'
+        + (f'<div class="rating-stars"><span class="filled-stars" style="width:{item["rating"] * 20:.0f}%"></span></div>'
+           if item["rating"] else "")
+        + "</div>"
+        for item in items
+    ))
+
+def render_shopclues(items):
+    return page_chrome("".join(
+        f'<div class="column col3"><a href="//www.shopclues.com/{item["id"]}.html">'
+        f'<h2>{escape(item["name"])}</h2></a>'
+        f'<span class="p_price">Rs.{item["price"]}</span><span class="old_prices">Rs.{item["mrp"]}</span>'
+        + (f'<span class="rating">{item["rating"]}</span>' if item["rating"] else "")
+        + "</div>"
+        for item in items
+    ))
+
+def render_flipkart(items):
+    return page_chrome("".join(
+        f'<div data-id="{item["id"]}"><a class="CGtC98" href="/p/{item["id"]}">'
+        f'<div class="KzDlHZ">{escape(item["name"])}</div></a>'
+        f'<div class="Nx9bqj">₹{item["price"]:,}</div><div class="yRaY8j">₹{item["mrp"]:,}</div>'
+        + (f'<div class="XQDdHH">{item["rating"]}</div>' if item["rating"] else "")
+        + "</div>"
+        for item in items
+    ))
+
+RENDERERS = {
+    "amazon": render_amazon,
+    "myntra": render_myntra,
+    "snapdeal": render_snapdeal,
+    "shopclues": render_shopclues,
+    "flipkart": render_flipkart
+}
+
+def generate_page(site, n=48, seed=42):
+    rng = random.Random(f"{site}-{seed}")
+    return RENDERERS[site]([make_item(rng, i) for i in range(n)])
+
+def load_pages(directory=None, n=48):
+    # Recorded pages win over generated ones so benchmarks track the real markup when it is available.
+    pages = {}
+    for site in SITES:
+        path = os.path.join(directory, f"{site}.html") if directory else None
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                pages[site] = f.read()
+        else:
+            pages[site] = generate_page(site, n)
+    return pages
+
+def make_catalog(n, seed=42, na_share=0.1):
+    rng = random.Random(seed)
+    products = []
+    for i in range(n):
+        item = make_item(rng, i)
+        rating = "N/A" if rng.random() < na_share else f"{item['rating'] or 4.0}"
+        discount = f"{round((item['mrp'] - item['price']) / item['mrp'] * 100)}% off" if item["mrp"] > item["price"] else "N/A"
+        products.append(Product(item["name"], item["price"], discount, rating, f"https://example.com/{item['id']}", rng.choice(SITES)))
+    return products
+
+def record_pages(directory, query):
+    from modules.http_fetch import fetch_html
+    from modules.scrapers.amazon import get_amazon_search_url
+    from modules.scrapers.myntra import get_myntra_search_url
+    from modules.scrapers.snapdeal import get_snapdeal_search_url
+    from modules.scrapers.shopclues import get_shopclues_search_url
+    from modules.scrapers.flipkart import get_flipkart_search_url
+    fetchers = {
+        "amazon": lambda: fetch_html(get_amazon_search_url(query), "Amazon"),
+        "myntra": lambda: fetch_html(get_myntra_search_url(query), "Myntra"),
+        "snapdeal": lambda: fetch_html(get_snapdeal_search_url(query), "Snapdeal"),
+        "shopclues": lambda: fetch_html(get_shopclues_search_url(query), "ShopClues"),
+        "flipkart": lambda: fetch_html(get_flipkart_search_url(query), "Flipkart")
+    }
+    os.makedirs(directory, exist_ok=True)
+    for site, fetch in fetchers.items():
+        html = fetch()
+        if not html:
+            print(f"{site}: fetch failed, keeping the generated page")
+            continue
+        with open(os.path.join(directory, f"{site}.html"), "w", encoding="utf-8") as f:
+            f.write(html)
+        print(f"{site}: saved {len(html) // 1024}KB")
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or generate search-result fixtures.")
+    parser.add_argument("--record", metavar="DIR", help="fetch live search pages into DIR")
+    parser.add_argument("--generate", metavar="DIR", help="write generated pages into DIR")
+    parser.add_argument("--query", default="running shoes")
+    parser.add_argument("--items", type=int, default=48)
+    args = parser.parse_args()
+    if args.record:
+        record_pages(args.record, args.query)
+    if args.generate:
+        os.makedirs(args.generate, exist_ok=True)
+        for site in SITES:
+            with open(os.path.join(args.generate, f"{site}.html"), "w", encoding="utf-8") as f:
+                f.write(generate_page(site, args.items))
+    if not (args.record or args.generate):
+        parser.error("pass --record DIR and/or --generate DIR")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# benchmarks/load_test.py
+# End-to-end load test of the search pipeline against the local mock retailer.
+# Run from the repository root: python -m benchmarks.load_test --qps 200 --duration 30 --latency-ms 80
+import os
+
+# Both settings are fixed at import time: a load test must never start Chrome, and its
+# queries must neither be answered from nor written to the real search cache.
+os.environ.setdefault("BROWSER_FALLBACK", "0")
+os.environ.setdefault("SEARCH_CACHE", "0")
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.mock_retailer import start_mock_retailer, add_server_arguments, server_options
+from config import SITE_BASE_URLS
+from modules.async_engine import create_session, async_search
+from modules.http_fetch import get_fetch_path_stats
+from modules.product_table import ProductTable
+from modules.search import search_all_sites
+
+def run_query(query):
+    result = search_all_sites(query)
+    ProductTable(result.products).get_rating_price_recommendations()
+    return len(result.products), result.partial
+
+def run_threaded(queries, qps, concurrency):
+    # Open loop: each query's latency is measured from when it was due, so a backed-up
+    # pipeline shows up as queueing delay instead of silently lowering the offered load.
+    samples = []
+
+    def timed(query, due):
+        found, partial = run_query(query)
+        samples.append((time.perf_counter() - due, found, partial))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for i, query in enumerate(queries):
+            due = start + i / qps
+            time.sleep(max(0.0, due - time.perf_counter()))
+            executor.submit(timed, query, due)
+    return samples, time.perf_counter() - start
+
+async def run_async(queries, qps, concurrency):
+    samples = []
+    semaphore = asyncio.Semaphore(concurrency)
+    async with create_session() as session:
+        async def timed(query, due):
+            async with semaphore:
+                result = await async_search(session, query)
+            ProductTable(result.products).get_rating_price_recommendations()
+            samples.append((time.perf_counter() - due, len(result.products), result.partial))
+
+        start = time.perf_counter()
+        tasks = []
+        for i, query in enumerate(queries):
+            due = start + i / qps
+            await asyncio.sleep(max(0.0, due - time.perf_counter()))
+            tasks.append(asyncio.create_task(timed(query, due)))
+        await asyncio.gather(*tasks)
+    return samples, time.perf_counter() - start
+
+def percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, round(q / 100 * (len(sorted_values) - 1)))]
+
+def report(samples, elapsed, server):
+    latencies = sorted(latency for latency, _, _ in samples)
+    partial = sum(1 for _, _, is_partial in samples if is_partial)
+    print(f"queries      {len(samples)} in {elapsed:.1f}s ({len(samples) / elapsed:.1f} QPS)")
+    print(f"latency      p50 {percentile(latencies, 50) * 1000:.0f}ms  p90 {percentile(latencies, 90) * 1000:.0f}ms  "
+          f"p99 {percentile(latencies, 99) * 1000:.0f}ms  max {latencies[-1] * 1000:.0f}ms")
+    print(f"products     {statistics.mean(found for _, found, _ in samples):.1f} per query, {partial} partial results")
+    print(f"retailer     {server.stats['requests']} requests, {server.stats['errors']} injected 503s")
+    for site, paths in get_fetch_path_stats().items():
+        print(f"{site:<12} {paths}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the search pipeline against a mock retailer.")
+    parser.add_argument("--qps", type=float, default=50, help="offered load in queries per second")
+    parser.add_argument("--duration", type=float, default=20, help="seconds of load")
+    parser.add_argument("--concurrency", type=int, default=256, help="queries in flight at most")
+    parser.add_argument("--engine", choices=["threads", "async"], default="threads")
+    parser.add_argument("--query", default="running shoes")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    server = start_mock_retailer(**server_options(args))
+    SITE_BASE_URLS.update(server.base_urls())
+    # Distinct queries make the mock render a fresh page for every search.
+    queries = [f"{args.query} {i}" for i in range(int(args.qps * args.duration))]
+    try:
+        if args.engine == "async":
+            samples, elapsed = asyncio.run(run_async(queries, args.qps, args.concurrency))
+        else:
+            samples, elapsed = run_threaded(queries, args.qps, args.concurrency)
+    finally:
+        server.shutdown()
+        server.server_close()
+    report(samples, elapsed, server)
+
+if __name__ == "__main__":
+    main()
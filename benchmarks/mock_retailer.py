@@ -0,0 +1,128 @@
+# benchmarks/mock_retailer.py
+# A local stand-in for all five retailers, serving fixture pages at /<site>/...
+# Run from the repository root: python -m benchmarks.mock_retailer --port 8800 --latency-ms 80 --error-rate 0.02
+# then export the printed *_BASE_URL variables before starting the scrapers.
+import argparse
+import random
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, unquote
+from benchmarks.fixtures import SITES, generate_page, load_pages, page_chrome
+
+SITE_NAMES = {"amazon": "Amazon", "myntra": "Myntra", "snapdeal": "Snapdeal", "shopclues": "ShopClues", "flipkart": "Flipkart"}
+
+class MockRetailer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, address, latency_ms=50, jitter=0.5, error_rate=0.0, pages=3, items=24, recorded=None):
+        super().__init__(address, MockRetailerHandler)
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.pages = pages
+        self.items = items
+        self.recorded = load_pages(recorded) if recorded else None
+        self.stats = {"requests": 0, "errors": 0}
+        self.stats_lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def base_urls(self):
+        return {name: f"{self.base_url}/{site}" for site, name in SITE_NAMES.items()}
+
+    def delay(self):
+        # Log-normal around the median latency gives the long right tail real retailers have.
+        if self.latency_ms > 0:
+            time.sleep(self.latency_ms * random.lognormvariate(0, self.jitter) / 1000)
+
+    def page(self, site, query, page):
+        if page > self.pages:
+            return page_chrome("")
+        if self.recorded:
+            return self.recorded[site]
+        return render_page(site, query, page, self.items)
+
+    def count(self, key):
+        with self.stats_lock:
+            self.stats[key] += 1
+
+@lru_cache(maxsize=2048)
+def render_page(site, query, page, items):
+    return generate_page(site, items, seed=f"{query}-{page}")
+
+class MockRetailerHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        server.count("requests")
+        url = urlsplit(self.path)
+        site, _, rest = url.path.lstrip("/").partition("/")
+        if site not in SITES:
+            return self.respond(404, "unknown retailer")
+        server.delay()
+        if random.random() < server.error_rate:
+            server.count("errors")
+            return self.respond(503, "Service Unavailable")
+        params = parse_qs(url.query)
+        query = (params.get("k") or params.get("q") or params.get("keyword") or [unquote(rest)])[0]
+        page = int((params.get("page") or ["1"])[0])
+        self.respond(200, server.page(site, query, page))
+
+    def respond(self, status, body):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_mock_retailer(host="127.0.0.1", port=0, **options):
+    server = MockRetailer((host, port), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def add_server_arguments(parser):
+    parser.add_argument("--latency-ms", type=float, default=50, help="median response latency")
+    parser.add_argument("--jitter", type=float, default=0.5, help="log-normal sigma of the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 503")
+    parser.add_argument("--pages", type=int, default=3, help="result pages per query; later pages are empty")
+    parser.add_argument("--items", type=int, default=24, help="products per generated page")
+    parser.add_argument("--recorded", metavar="DIR", help="serve recorded <site>.html pages instead")
+
+def server_options(args):
+    return {
+        "latency_ms": args.latency_ms, "jitter": args.jitter, "error_rate": args.error_rate,
+        "pages": args.pages, "items": args.items, "recorded": args.recorded
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve fixture search pages for every retailer.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8800)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+    server = MockRetailer((args.host, args.port), **server_options(args))
+    for name, url in server.base_urls().items():
+        print(f"export {name.upper()}_BASE_URL={url}")
+    print("export BROWSER_FALLBACK=0")
+    print("export SEARCH_CACHE=0")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"served {server.stats['requests']} requests, {server.stats['errors']} injected 503s")
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# benchmarks/parse_bench.py
+# Run from the repository root: python -m benchmarks.parse_bench --pages DIR
+# DIR holds saved search pages named amazon.html, myntra.html, snapdeal.html, shopclues.html, flipkart.html.
+import argparse
+import os
+import statistics
+import time
+from modules.parsing import available_backends, make_soup
+from modules.scrapers.amazon import parse_amazon_products
+from modules.scrapers.myntra import parse_myntra_products
+from modules.scrapers.snapdeal import parse_snapdeal_products
+from modules.scrapers.shopclues import parse_shopclues_products
+from modules.scrapers.flipkart import parse_flipkart_products
+
+SITE_PARSERS = {
+    "amazon": parse_amazon_products,
+    "myntra": parse_myntra_products,
+    "snapdeal": parse_snapdeal_products,
+    "shopclues": parse_shopclues_products,
+    "flipkart": parse_flipkart_products
+}
+
+def time_parse(parse_products, html, backend, repeat, max_results):
+    samples = []
+    found = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        found = len(parse_products(make_soup(html, backend), max_results))
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples), found
+
+def main():
+    parser = argparse.ArgumentParser(description="Time HTML parsing per site and parser backend.")
+    parser.add_argument("--pages", required=True, help="directory of saved <site>.html search pages")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--max-results", type=int, default=50)
+    args = parser.parse_args()
+    backends = available_backends()
+    print(f"{'site':<10} {'size':>9}  " + "  ".join(f"{backend:>18}" for backend in backends))
+    for site, parse_products in SITE_PARSERS.items():
+        path = os.path.join(args.pages, f"{site}.html")
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        cells = []
+        for backend in backends:
+            seconds, found = time_parse(parse_products, html, backend, args.repeat, args.max_results)
+            cells.append(f"{seconds * 1000:9.2f}ms ({found:>3})")
+        print(f"{site:<10} {len(html) // 1024:>7}KB  " + "  ".join(f"{cell:>18}" for cell in cells))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# benchmarks/suite.py
+# Run from the repository root: python -m benchmarks.suite [--pages DIR] [--save FILE] [--baseline FILE]
+# Replays search pages through every site parser and times ranking, knapsack and the price index
+# on synthetic catalogs. No network access is needed.
+import argparse
+import json
+import logging
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from benchmarks.fixtures import load_pages, make_catalog
+from modules.parsing import make_soup
+from modules.scrapers.amazon import AMAZON_CONTAINER, parse_amazon_products
+from modules.scrapers.myntra import MYNTRA_CONTAINER, parse_myntra_html, parse_myntra_products
+from modules.scrapers.snapdeal import SNAPDEAL_CONTAINER, parse_snapdeal_products
+from modules.scrapers.shopclues import SHOPCLUES_CONTAINER, parse_shopclues_products
+from modules.scrapers.flipkart import parse_flipkart_html
+from modules.sorting import get_rating_price_recommendations, sort_by_price_asc, sort_by_discount, impute_na_ratings
+from modules.product_table import ProductTable
+from modules.knapsack import budget_knapsack_dp
+from modules.price_index import PriceIndex
+from modules.avl_tree import range_query_avl
+from modules.matching import dedupe_products
+
+def measure(fn, repeat, warmup=1):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    # Memory is traced in a separate run; tracemalloc slows allocation-heavy code several times over.
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    samples.sort()
+    return {
+        "ops_per_sec": len(samples) / sum(samples),
+        "p50_ms": statistics.median(samples) * 1000,
+        "p99_ms": samples[min(len(samples) - 1, round(0.99 * (len(samples) - 1)))] * 1000,
+        "peak_kb": peak / 1024
+    }
+
+def parse_cases(pages, max_results):
+    def strained(parse_products, container):
+        return lambda html: parse_products(make_soup(html, parse_only=container), max_results)
+
+    parsers = {
+        "amazon": strained(parse_amazon_products, AMAZON_CONTAINER),
+        "myntra": lambda html: parse_myntra_html(html, max_results),
+        "myntra-cards": strained(parse_myntra_products, MYNTRA_CONTAINER),
+        "snapdeal": strained(parse_snapdeal_products, SNAPDEAL_CONTAINER),
+        "shopclues": strained(parse_shopclues_products, SHOPCLUES_CONTAINER),
+        "flipkart": lambda html: parse_flipkart_html(html, max_results)
+    }
+    cases = {}
+    for name, parse in parsers.items():
+        html = pages[name.split("-")[0]]
+        found = len(parse(html))
+        if not found:
+            print(f"warning: {name} page yields no products; its layout may have changed", file=sys.stderr)
+        cases[f"parse.{name}"] = lambda parse=parse, html=html: parse(html)
+    return cases
+
+def catalog_cases(catalog_size, knapsack_size, budget, queries):
+    catalog = make_catalog(catalog_size)
+    impute_na_ratings(catalog)
+    table = ProductTable(catalog)
+    price_index = PriceIndex(catalog)
+    rng = random.Random(7)
+    ranges = []
+    for _ in range(queries):
+        lo = rng.randint(199, 9999)
+        ranges.append((lo, lo + 500))
+
+    def range_queries():
+        for lo, hi in ranges:
+            range_query_avl(price_index.root, lo, hi, [])
+
+    def top_k_queries():
+        for lo, hi in ranges:
+            price_index.top_k(lo, hi, 10)
+
+    knapsack_items = catalog[:knapsack_size]
+    return {
+        "rank.rating_price_heap": lambda: get_rating_price_recommendations(catalog, 10),
+        "rank.price_heap": lambda: sort_by_price_asc(catalog, 10),
+        "rank.discount_heap": lambda: sort_by_discount(catalog, 10),
+        "rank.table_build": lambda: ProductTable(catalog),
+        "rank.table_rating_price": lambda: table.get_rating_price_recommendations(10),
+        "knapsack.exact": lambda: budget_knapsack_dp(knapsack_items, budget),
+        "knapsack.fptas": lambda: budget_knapsack_dp(knapsack_items, budget, epsilon=0.1),
+        "avl.build": lambda: PriceIndex(catalog),
+        "avl.range_query": range_queries,
+        "avl.top_k": top_k_queries,
+        "match.dedupe": lambda: dedupe_products(catalog)
+    }
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before and result["p50_ms"] > before["p50_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p50 {before['p50_ms']:.3f}ms -> {result['p50_ms']:.3f}ms")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline scraper and ranking benchmarks.")
+    parser.add_argument("--pages", help="directory of recorded <site>.html pages (generated pages otherwise)")
+    parser.add_argument("--only", help="run only cases whose name starts with this prefix")
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--max-results", type=int, default=50)
+    parser.add_argument("--catalog-size", type=int, default=20_000)
+    parser.add_argument("--knapsack-size", type=int, default=300)
+    parser.add_argument("--budget", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--save", metavar="FILE", help="write the results as JSON")
+    parser.add_argument("--baseline", metavar="FILE", help="fail if any p50 regresses past --tolerance")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)  # per-item parser warnings would drown the table
+
+    cases = parse_cases(load_pages(args.pages), args.max_results)
+    cases.update(catalog_cases(args.catalog_size, args.knapsack_size, args.budget, args.queries))
+    results = {}
+    print(f"{'case':<26} {'ops/sec':>10} {'p50':>10} {'p99':>10} {'peak mem':>10}")
+    for name, fn in cases.items():
+        if args.only and not name.startswith(args.only):
+            continue
+        result = results[name] = measure(fn, args.repeat)
+        print(f"{name:<26} {result['ops_per_sec']:>10.1f} {result['p50_ms']:>8.2f}ms "
+              f"{result['p99_ms']:>8.2f}ms {result['peak_kb']:>8.0f}KB")
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 # config.py
+import os
 import random
 
 # Logging configuration
@@ -7,11 +8,104 @@ LOGGING_CONFIG = {
     "format": "%(asctime)s - %(levelname)s - %(message)s"
 }
 
+# Retailer base URLs; override one with e.g. FLIPKART_BASE_URL=http://127.0.0.1:8800/flipkart
+# to point its scraper at the mock retailer in benchmarks/mock_retailer.py.
+SITE_BASE_URLS = {
+    site: os.environ.get(f"{site.upper()}_BASE_URL", url).rstrip("/")
+    for site, url in {
+        "Amazon": "https://www.amazon.in",
+        "Myntra": "https://www.myntra.com",
+        "Snapdeal": "https://www.snapdeal.com",
+        "ShopClues": "https://www.shopclues.com",
+        "Flipkart": "https://www.flipkart.com"
+    }.items()
+}
+
+# Metrics settings
+METRICS_ENABLED = True  # per-stage timing histograms, exported with --metrics
+METRICS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)  # seconds
+
+# Profiling settings
+PROFILE_SAMPLE_INTERVAL = 0.005  # seconds between stack samples in --profile sample mode
+
 # Scraper settings
 MAX_RESULTS_PER_SITE = 10
 TIMEOUT = 10
+HTTP_FIRST = True  # try a plain HTTP fetch before starting a browser
+BROWSER_FALLBACK = os.environ.get("BROWSER_FALLBACK", "1") != "0"  # "0" keeps runs HTTP-only (load tests)
+BROWSER_EXTRACTION = "js"  # "js" extracts products inside the page, "html" parses the containers in Python
+HTML_PARSER = "auto"  # "lxml", "selectolax", "html.parser" or "auto" (lxml when installed)
+SELECTOR_PLAN_LEARN_ITEMS = 3  # items per page that try every fallback selector before one is pinned
+SEARCH_DEADLINE = 90  # seconds to wait for all sites before ranking what has arrived
+HEDGE_REQUESTS = True  # re-issue a site's request once it runs past that site's recent p95 latency
+HEDGE_PERCENTILE = 95
+HEDGE_MIN_SAMPLES = 5
+HEDGE_DEFAULT_P95 = 30  # seconds; stands in for a site's p95 until HEDGE_MIN_SAMPLES real scrapes are seen
+HEDGE_HISTORY = 50
 SCROLL_COUNT = 8
 SCROLL_PAUSE = 2
+SCROLL_MODE = "adaptive"  # "adaptive" stops once enough products load, "fixed" always scrolls SCROLL_COUNT times
+SCROLL_DEADLINE = 15
+SCROLL_POLL_INTERVAL = 0.25
+SCROLL_STABLE_POLLS = 4
+
+# Amazon pagination settings
+AMAZON_PARALLEL_PAGES = True  # fetch result pages concurrently when more than one page is needed
+AMAZON_MAX_CONCURRENCY = 3
+AMAZON_REQUESTS_PER_SECOND = 1.0
+AMAZON_EXTRA_PAGES = 1  # spare page fetched in case duplicates leave the last page short
+
+# Async scraping engine settings
+USE_ASYNC_ENGINE = False
+ASYNC_CONNECTION_LIMIT = 200
+ASYNC_LIMIT_PER_HOST = 8
+ASYNC_KEEPALIVE_TIMEOUT = 30
+ASYNC_RETRIES = 2
+ASYNC_BACKOFF_BASE = 1.5
+ASYNC_QUERY_CONCURRENCY = 100
+
+# Cross-site de-duplication settings
+MATCH_ENABLED = True  # merge listings of the same item before ranking
+MATCH_NUM_PERM = 64  # MinHash signature length
+MATCH_BANDS = 16  # LSH bands; 16 bands of 4 rows catch pairs from about 0.5 Jaccard upward
+MATCH_THRESHOLD = 0.6  # title-token Jaccard similarity needed to merge two listings
+MATCH_MAX_PRICE_RATIO = 1.6  # listings whose prices differ by more than this factor never merge
+
+# Budget knapsack settings
+KNAPSACK_PRICE_GRANULARITY = 1  # rupees per DP step; prices are rounded up to a multiple of this
+KNAPSACK_DEFAULT_EPSILON = 0.05  # suggested tolerance for the (1-ε) approximation mode
+
+# Batch mode settings
+BATCH_CONCURRENCY = 16
+BATCH_SITE_RATES = {  # requests per second allowed against each retailer
+    "Amazon": 0.5,
+    "Flipkart": 1.0,
+    "Myntra": 1.0,
+    "Snapdeal": 1.0,
+    "ShopClues": 1.0
+}
+BATCH_PROGRESS_EVERY = 25
+
+# Search result cache settings
+CACHE_ENABLED = os.environ.get("SEARCH_CACHE", "1") != "0"  # "0" bypasses the cache (load tests)
+CACHE_PATH = ".cache/search_cache.sqlite3"
+CACHE_DEFAULT_TTL = 3600  # seconds
+CACHE_TTLS = {
+    "Amazon": 1800,
+    "Flipkart": 1800,
+    "Myntra": 3600,
+    "Snapdeal": 3600,
+    "ShopClues": 7200
+}
+CACHE_STALE_TTL = 1800  # extra seconds a stale entry is served while it is refreshed
+CACHE_MAX_ENTRIES = 5000
+CACHE_MAX_BYTES = 200 * 1024 * 1024
+CACHE_RAW_HTML = False
+
+# Selenium driver pool settings
+DRIVER_POOL_SIZE = 4
+DRIVER_MAX_PAGES = 25
+DRIVER_CHECKOUT_TIMEOUT = 60
 
 # User agents for HTTP requests and Selenium
 USER_AGENTS = [
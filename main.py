@@ -1,20 +1,27 @@
 # main.py
+import argparse
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from modules.scrapers.amazon import scrape_amazon
-from modules.scrapers.myntra import scrape_myntra
-from modules.scrapers.snapdeal import scrape_snapdeal
-from modules.scrapers.shopclues import scrape_shopclues
-from modules.scrapers.flipkart import scrape_flipkart
-from modules.sorting import (
-    sort_by_price_desc, sort_by_price_asc, sort_by_rating, sort_by_discount,
-    get_rating_price_recommendations, impute_na_ratings
-)
+import sys
+from contextlib import nullcontext
+from modules.sorting import impute_na_ratings
+from modules.product_table import ProductTable
 from modules.knapsack import budget_knapsack_dp
-from modules.avl_tree import insert_avl, range_query_avl
-from config import MAX_RESULTS_PER_SITE
+from modules.price_index import PriceIndex
+from modules.matching import dedupe_products
+from modules.http_fetch import get_fetch_path_stats
+from modules.selector_plan import get_selector_stats
+from modules.metrics import timer, write_metrics
+from modules.profiling import profile_run
+from modules.async_engine import run_async_search
+from modules.search import search_all_sites
+from modules.streaming import LiveTopK
+from modules.batch import read_queries, run_batch, run_batch_async
+from config import (
+    MAX_RESULTS_PER_SITE, USE_ASYNC_ENGINE, BATCH_CONCURRENCY, ASYNC_QUERY_CONCURRENCY,
+    KNAPSACK_PRICE_GRANULARITY, KNAPSACK_DEFAULT_EPSILON, MATCH_ENABLED
+)
 
-def handle_range_query(products):
+def handle_range_query(price_index):
     try:
         min_price = float(input("Enter minimum price (₹): ").strip())
         max_price = float(input("Enter maximum price (₹): ").strip())
@@ -24,21 +31,13 @@ def handle_range_query(products):
         if min_price > max_price:
             print("Minimum price cannot exceed maximum price.")
             return [], None, None
-        root = None
-        for product in products:
-            if product.price != "N/A":
-                root = insert_avl(root, product)
-        if not root:
+        if not price_index:
             return [], None, None
-        range_products = []
-        range_query_avl(root, min_price, max_price, range_products)
-        if not range_products:
+        ranked = price_index.top_k(min_price, max_price, MAX_RESULTS_PER_SITE)
+        if not ranked:
             return [], None, None
-        scores = [get_rating_price_score(product) for product in range_products]
-        indexed_products = [(scores[i], i, range_products[i]) for i in range(len(range_products))]
-        indexed_products.sort(reverse=True)
         top_products = []
-        for score, _, product in indexed_products[:min(MAX_RESULTS_PER_SITE, len(range_products))]:
+        for score, product in ranked:
             product.score = score
             top_products.append(product)
         return top_products, min_price, max_price
@@ -46,10 +45,6 @@ def handle_range_query(products):
         print("Invalid input. Please enter numeric values for prices.")
         return [], None, None
 
-def get_rating_price_score(product):
-    from modules.sorting import compute_rating_price_score
-    return compute_rating_price_score(product)
-
 def handle_budget_knapsack(products):
     try:
         budget = int(input("Enter budget (₹): ").strip())
@@ -57,7 +52,16 @@ def handle_budget_knapsack(products):
         if budget <= 0 or max_items <= 0:
             print("Budget and max items must be positive!")
             return [], 0, 0, 0, 0
-        selected_products, total_score, total_cost = budget_knapsack_dp(products, budget, max_items)
+        epsilon_text = input(f"Approximation tolerance ε, e.g. {KNAPSACK_DEFAULT_EPSILON} (Enter for exact): ").strip()
+        epsilon = float(epsilon_text) if epsilon_text else None
+        if epsilon is not None and not 0 < epsilon < 1:
+            print("Tolerance must be between 0 and 1!")
+            return [], 0, 0, 0, 0
+        if epsilon:
+            print(f"Using (1-ε) approximation: score is at least {100 * (1 - epsilon):.0f}% of the optimum.")
+        elif KNAPSACK_PRICE_GRANULARITY > 1:
+            print(f"Prices rounded up to multiples of ₹{KNAPSACK_PRICE_GRANULARITY}.")
+        selected_products, total_score, total_cost = budget_knapsack_dp(products, budget, max_items, epsilon=epsilon)
         return selected_products, total_score, total_cost, budget, max_items
     except ValueError:
         print("Please enter valid numbers!")
@@ -74,33 +78,50 @@ def display_menu():
     print("7) Exit")
     return input("Enter choice (1-7): ").strip()
 
-def main():
+def make_stream_printer(live):
+    def print_provisional(site, products):
+        live.add(products)
+        ranking = live.ranking()
+        print(f"\n[{site} done: {len(products)} products] Provisional Top {len(ranking)} "
+              f"of {live.valid_count} so far (avg rating {live.average_rating:.1f})")
+        for i, (score, product) in enumerate(ranking, start=1):
+            print(f"  {i}. [{product.site}] {product.name[:60]} — ₹{product.price} | Score: {score:.2f}")
+    return print_provisional
+
+def run_search(product_name, stream=False, engine="threads"):
+    on_site_done = make_stream_printer(LiveTopK()) if stream else None
+    search = run_async_search if engine == "async" else search_all_sites
+    with timer("search"):
+        result = search(product_name, on_site_done=on_site_done)
+    if result.partial:
+        print(f"\nNote: partial results after {result.elapsed:.1f}s — "
+              f"failed: {', '.join(result.failed_sites) or 'none'}; "
+              f"no response in time: {', '.join(result.missing_sites) or 'none'}")
+    return result.products
+
+def main(stream=False, profile=None, profiler="sample", engine="threads"):
     product_name = input("Enter product name to search: ").strip()
     logging.info(f" Searching for '{product_name}' across Amazon, Myntra, Snapdeal, ShopClues, and Flipkart...\n")
-    all_products = []
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        future_to_scraper = {
-            executor.submit(scrape_amazon, product_name): "Amazon",
-            executor.submit(scrape_myntra, product_name): "Myntra",
-            executor.submit(scrape_snapdeal, product_name): "Snapdeal",
-            executor.submit(scrape_shopclues, product_name): "ShopClues",
-            executor.submit(scrape_flipkart, product_name): "Flipkart"
-        }
-        for future in as_completed(future_to_scraper):
-            try:
-                products = future.result()
-                all_products.extend(products)
-                logging.info(f"{future_to_scraper[future]}: {len(products)} products scraped")
-            except Exception as e:
-                logging.error(f"Error in {future_to_scraper[future]}: {e}")
+    with profile_run(profile, profiler) if profile else nullcontext():
+        all_products = run_search(product_name, stream, engine)
+    for site, paths in get_fetch_path_stats().items():
+        logging.info(f"{site} fetch paths: {paths}")
+    for (site, field), hit_rates in get_selector_stats().items():
+        logging.debug(f"{site} {field} selector hit rates: {hit_rates}")
     if not all_products:
         print("No products scraped.")
         return
+    if MATCH_ENABLED:
+        scraped_count = len(all_products)
+        all_products = dedupe_products(all_products)
+        print(f"\nMerged {scraped_count - len(all_products)} duplicate listings across sites")
     na_count, avg_rating = impute_na_ratings(all_products)
     print(f"\nImputed {na_count} 'N/A' ratings with average {avg_rating:.1f}")
     print("\nRating-Price Recommendation (Top 10 Products)")
     print("="*60)
-    top_products, valid_count = get_rating_price_recommendations(all_products)
+    table = ProductTable(all_products)
+    price_index = PriceIndex(all_products)
+    top_products, valid_count = table.get_rating_price_recommendations()
     if not top_products:
         print("No products available for recommendation.")
     else:
@@ -114,19 +135,19 @@ def main():
     while True:
         choice = display_menu()
         if choice == "1":
-            top_products = sort_by_price_desc(all_products)
+            top_products = table.sort_by_price_desc()
             print("\nTop 10 Products Sorted by Price (High to Low):")
         elif choice == "2":
-            top_products = sort_by_price_asc(all_products)
+            top_products = table.sort_by_price_asc()
             print("\nTop 10 Products Sorted by Price (Low to High):")
         elif choice == "3":
-            top_products = sort_by_rating(all_products)
+            top_products = table.sort_by_rating()
             print("\nTop 10 Products Sorted by Rating (High to Low):")
         elif choice == "4":
-            top_products = sort_by_discount(all_products)
+            top_products = table.sort_by_discount()
             print("\nTop 10 Products Sorted by Discount (High to Low):")
         elif choice == "5":
-            top_products, min_price, max_price = handle_range_query(all_products)
+            top_products, min_price, max_price = handle_range_query(price_index)
             if min_price is not None and max_price is not None:
                 print(f"\nTop 10 Products in Price Range ₹{min_price:.2f} to ₹{max_price:.2f} (Greedy Top 10):")
         elif choice == "6":
@@ -157,5 +178,51 @@ def main():
                     score_text = f"Score: {product.temp_score:.2f}"
                 print(f"{i}. {product}{score_text}")
 
+def run_batch_mode(args):
+    query_file = sys.stdin if args.batch == "-" else open(args.batch, encoding="utf-8")
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        if args.engine == "async":
+            run_batch_async(read_queries(query_file), out, concurrency=args.concurrency or ASYNC_QUERY_CONCURRENCY)
+        else:
+            run_batch(read_queries(query_file), out, concurrency=args.concurrency or BATCH_CONCURRENCY)
+    finally:
+        if query_file is not sys.stdin:
+            query_file.close()
+        if out is not sys.stdout:
+            out.close()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Search and rank products across Indian retailers.")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="run non-interactively over queries in FILE (one per line, '-' for stdin)")
+    parser.add_argument("--output", metavar="FILE", default="-",
+                        help="where batch mode writes JSON Lines results (default: stdout)")
+    parser.add_argument("--concurrency", type=int,
+                        help=f"maximum site searches in flight during batch mode (default {BATCH_CONCURRENCY}); "
+                             f"with the async engine, queries in flight (default {ASYNC_QUERY_CONCURRENCY})")
+    parser.add_argument("--engine", choices=["threads", "async"], default="async" if USE_ASYNC_ENGINE else "threads",
+                        help="'async' scrapes over one pooled aiohttp session; in batch mode it runs many "
+                             "queries concurrently in one event loop")
+    parser.add_argument("--stream", action="store_true",
+                        help="print provisional recommendations as each site finishes")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="profile the search and write the result to FILE")
+    parser.add_argument("--profiler", choices=["sample", "cprofile"], default="sample",
+                        help="'sample' writes collapsed stacks for flamegraphs, 'cprofile' writes pstats files "
+                             "(per-site files only before Python 3.12)")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="write per-stage timings on exit (.json for JSON, otherwise Prometheus text)")
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    try:
+        if args.batch:
+            with profile_run(args.profile, args.profiler) if args.profile else nullcontext():
+                run_batch_mode(args)
+        else:
+            main(stream=args.stream, profile=args.profile, profiler=args.profiler, engine=args.engine)
+    finally:
+        if args.metrics:
+            write_metrics(args.metrics)
\ No newline at end of file
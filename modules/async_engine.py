@@ -0,0 +1,194 @@
+# modules/async_engine.py
+import asyncio
+import logging
+import random
+import time
+import aiohttp
+from modules.parsing import make_soup
+from modules.cache import get_cached_products, store_products
+from modules.http_fetch import get_http_headers, record_fetch_path
+from modules.search import SCRAPERS, SearchResult, submit_daemon
+from modules.scrapers.amazon import (
+    AMAZON_CONTAINER, get_amazon_headers, get_amazon_search_url, parse_amazon_products
+)
+from modules.scrapers.myntra import get_myntra_search_url, parse_myntra_html, scrape_myntra_browser
+from modules.scrapers.snapdeal import (
+    SNAPDEAL_CONTAINER, get_snapdeal_search_url, parse_snapdeal_products, scrape_snapdeal_browser
+)
+from modules.scrapers.shopclues import (
+    SHOPCLUES_CONTAINER, get_shopclues_search_url, parse_shopclues_products, scrape_shopclues_browser
+)
+from modules.scrapers.flipkart import get_flipkart_search_url, parse_flipkart_html, scrape_flipkart_browser
+from config import (
+    MAX_RESULTS_PER_SITE, SEARCH_DEADLINE, TIMEOUT, HTTP_FIRST, BROWSER_FALLBACK, ASYNC_CONNECTION_LIMIT, ASYNC_LIMIT_PER_HOST,
+    ASYNC_KEEPALIVE_TIMEOUT, ASYNC_RETRIES, ASYNC_BACKOFF_BASE, ASYNC_QUERY_CONCURRENCY
+)
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+def create_session():
+    connector = aiohttp.TCPConnector(
+        limit=ASYNC_CONNECTION_LIMIT,
+        limit_per_host=ASYNC_LIMIT_PER_HOST,
+        keepalive_timeout=ASYNC_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=300
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=TIMEOUT))
+
+def get_backoff_delay(attempt):
+    return ASYNC_BACKOFF_BASE * (2 ** attempt) + random.uniform(0, ASYNC_BACKOFF_BASE)
+
+async def async_fetch_html(session, url, site, headers=None, retries=ASYNC_RETRIES):
+    for attempt in range(retries + 1):
+        try:
+            async with session.get(url, headers=headers or get_http_headers()) as res:
+                if res.status == 200:
+                    return await res.text()
+                if res.status not in RETRYABLE_STATUSES:
+                    logging.warning(f"{site} returned {res.status} for {url}")
+                    return None
+                logging.info(f"{site} returned {res.status} — retrying...")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logging.info(f"{site} fetch error for {url}: {e}")
+        if attempt < retries:
+            await asyncio.sleep(get_backoff_delay(attempt))
+    return None
+
+def soup_parser(parse_products, container=None, site="all"):
+    def parse(html, max_results):
+        return parse_products(make_soup(html, parse_only=container, site=site), max_results) if html else []
+    return parse
+
+async def async_scrape_amazon(session, query, max_results=MAX_RESULTS_PER_SITE):
+    all_products = []
+    max_pages = (max_results + 9) // 10
+    for page in range(1, max_pages + 1):
+        url = get_amazon_search_url(query, page)
+        logging.info(f"Scraping Amazon page {page}...")
+        html = await async_fetch_html(session, url, "Amazon", headers=get_amazon_headers())
+        soup = make_soup(html, parse_only=AMAZON_CONTAINER, site="Amazon") if html else None
+        page_products = parse_amazon_products(soup, max_results - len(all_products))
+        logging.info(f"Found {len(page_products)} products on page {page}")
+        all_products.extend(page_products)
+        if len(all_products) >= max_results:
+            break
+        await asyncio.sleep(random.uniform(2, 5))
+    return all_products[:max_results]
+
+async def async_scrape_http_first(session, site, url, parse_html, browser_scraper, query, max_results):
+    if HTTP_FIRST:
+        html = await async_fetch_html(session, url, site)
+        products = parse_html(html, max_results)
+        if products:
+            record_fetch_path(site, "http")
+            return products
+        if not BROWSER_FALLBACK:
+            record_fetch_path(site, "failed")
+            return products
+        logging.info(f"{site}: HTTP path returned no products, falling back to browser")
+    try:
+        # A daemon thread, like the threaded engine's, so a browser run cut off by the search
+        # deadline does not hold up asyncio.run() or process exit.
+        products = await asyncio.wrap_future(submit_daemon(site, browser_scraper, query, max_results))
+    except Exception:
+        record_fetch_path(site, "failed")
+        raise
+    record_fetch_path(site, "browser" if products else "failed")
+    return products
+
+async def async_scrape_myntra(session, query, max_results=MAX_RESULTS_PER_SITE):
+    return await async_scrape_http_first(session, "Myntra", get_myntra_search_url(query),
+                                         parse_myntra_html, scrape_myntra_browser, query, max_results)
+
+async def async_scrape_snapdeal(session, query, max_results=MAX_RESULTS_PER_SITE):
+    return await async_scrape_http_first(session, "Snapdeal", get_snapdeal_search_url(query),
+                                         soup_parser(parse_snapdeal_products, SNAPDEAL_CONTAINER, "Snapdeal"), scrape_snapdeal_browser,
+                                         query, max_results)
+
+async def async_scrape_shopclues(session, query, max_results=MAX_RESULTS_PER_SITE):
+    return await async_scrape_http_first(session, "ShopClues", get_shopclues_search_url(query),
+                                         soup_parser(parse_shopclues_products, SHOPCLUES_CONTAINER, "ShopClues"), scrape_shopclues_browser,
+                                         query, max_results)
+
+async def async_scrape_flipkart(session, query, max_results=MAX_RESULTS_PER_SITE):
+    return await async_scrape_http_first(session, "Flipkart", get_flipkart_search_url(query),
+                                         parse_flipkart_html, scrape_flipkart_browser,
+                                         query, max_results)
+
+ASYNC_SCRAPERS = {
+    "Amazon": async_scrape_amazon,
+    "Myntra": async_scrape_myntra,
+    "Snapdeal": async_scrape_snapdeal,
+    "ShopClues": async_scrape_shopclues,
+    "Flipkart": async_scrape_flipkart
+}
+
+async def async_cached_scrape(session, site, query, max_results=MAX_RESULTS_PER_SITE, limiter=None):
+    # Shares the threaded engine's search cache; stale entries are refreshed by the threaded scraper.
+    products = get_cached_products(site, SCRAPERS[site], query, max_results)
+    if products is not None:
+        return products
+    if limiter:
+        await limiter.acquire_async()
+    products = await ASYNC_SCRAPERS[site](session, query, max_results)
+    store_products(site, query, products, max_results)
+    return products
+
+async def async_search(session, query, max_results=MAX_RESULTS_PER_SITE, on_site_done=None,
+                       deadline=SEARCH_DEADLINE, limiters=None):
+    # The asyncio counterpart of search_all_sites, minus hedging: sites still running at the
+    # deadline are cancelled and reported as missing.
+    start = time.monotonic()
+    tasks = {
+        asyncio.create_task(async_cached_scrape(session, site, query, max_results, (limiters or {}).get(site))): site
+        for site in ASYNC_SCRAPERS
+    }
+    all_products, completed, failed = [], [], []
+    errors = {}
+    pending = set(tasks)
+    end = start + deadline if deadline else None
+    while pending:
+        timeout = None if end is None else end - time.monotonic()
+        if timeout is not None and timeout <= 0:
+            break
+        done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            site = tasks[task]
+            try:
+                products = task.result()
+            except Exception as e:
+                logging.error(f"Error in {site}: {e}")
+                failed.append(site)
+                errors[site] = str(e)
+                products = []
+            else:
+                logging.info(f"{site}: {len(products)} products scraped")
+                completed.append(site)
+            all_products.extend(products)
+            if on_site_done:
+                on_site_done(site, products)
+    for task in pending:
+        task.cancel()
+    missing = [site for task, site in tasks.items() if task in pending]
+    if missing:
+        logging.warning(f"Search deadline of {deadline}s passed, continuing without {', '.join(missing)}")
+    return SearchResult(all_products, completed, failed, missing, [], time.monotonic() - start, errors)
+
+async def async_search_many(queries, max_results=MAX_RESULTS_PER_SITE, concurrency=ASYNC_QUERY_CONCURRENCY,
+                            on_result=None, limiters=None, deadline=SEARCH_DEADLINE):
+    # Every query shares one session; on_result(query, result) is called as each query finishes.
+    semaphore = asyncio.Semaphore(concurrency)
+    async with create_session() as session:
+        async def run(query):
+            async with semaphore:
+                result = await async_search(session, query, max_results, deadline=deadline, limiters=limiters)
+            if on_result:
+                on_result(query, result)
+            return query, result
+        return dict(await asyncio.gather(*(run(query) for query in queries)))
+
+def run_async_search(query, max_results=MAX_RESULTS_PER_SITE, on_site_done=None):
+    async def search():
+        async with create_session() as session:
+            return await async_search(session, query, max_results, on_site_done)
+    return asyncio.run(search())
@@ -1,16 +1,40 @@
 # modules/avl_tree.py
+import bisect
+import heapq
+import itertools
+from modules.sorting import compute_rating_price_score
+
 class AVLNode:
-    def __init__(self, product):
-        self.product = product
+    # Equal-priced products share one node, kept in a bucket ordered by score (best first).
+    __slots__ = ("price", "products", "neg_scores", "max_score", "left", "right", "height")
+
+    def __init__(self, product, score):
+        self.price = product.price
+        self.products = [product]
+        self.neg_scores = [-score]
+        self.max_score = score
         self.left = None
         self.right = None
         self.height = 1
 
+    @property
+    def product(self):
+        return self.products[0]
+
+    def add(self, product, score):
+        i = bisect.bisect_right(self.neg_scores, -score)
+        self.neg_scores.insert(i, -score)
+        self.products.insert(i, product)
+
 def get_height(node):
     return node.height if node else 0
 
+def get_max_score(node):
+    return node.max_score if node else float("-inf")
+
 def update_height(node):
     node.height = max(get_height(node.left), get_height(node.right)) + 1
+    node.max_score = max(-node.neg_scores[0], get_max_score(node.left), get_max_score(node.right))
 
 def get_balance(node):
     return get_height(node.left) - get_height(node.right) if node else 0
@@ -33,38 +57,128 @@ def right_rotate(x):
     update_height(y)
     return y
 
-def insert_avl(root, product):
-    if not root:
-        return AVLNode(product)
-    if product.price < root.product.price:
-        root.left = insert_avl(root.left, product)
-    elif product.price > root.product.price:
-        root.right = insert_avl(root.right, product)
-    else:
-        return root  # No duplicates
-
-    update_height(root)
-    balance = get_balance(root)
-
-    if balance > 1 and product.price < root.left.product.price:
-        return right_rotate(root)
-    if balance < -1 and product.price > root.right.product.price:
-        return left_rotate(root)
-    if balance > 1 and product.price > root.left.product.price:
-        root.left = left_rotate(root.left)
-        return right_rotate(root)
-    if balance < -1 and product.price < root.right.product.price:
-        root.right = right_rotate(root.right)
-        return left_rotate(root)
-
-    return root
+def rebalance(node):
+    update_height(node)
+    balance = get_balance(node)
+    if balance > 1:
+        if get_balance(node.left) < 0:
+            node.left = left_rotate(node.left)
+        return right_rotate(node)
+    if balance < -1:
+        if get_balance(node.right) > 0:
+            node.right = right_rotate(node.right)
+        return left_rotate(node)
+    return node
+
+def insert_avl(root, product, score=None):
+    if score is None:
+        score = compute_rating_price_score(product)
+    path = []
+    node = root
+    while node:
+        if product.price < node.price:
+            path.append((node, True))
+            node = node.left
+        elif product.price > node.price:
+            path.append((node, False))
+            node = node.right
+        else:
+            node.add(product, score)
+            for ancestor in [node] + [parent for parent, _ in path]:
+                ancestor.max_score = max(ancestor.max_score, score)
+            return root
+    child = AVLNode(product, score)
+    for parent, went_left in reversed(path):
+        height, max_score = parent.height, parent.max_score
+        if went_left:
+            parent.left = child
+        else:
+            parent.right = child
+        child = rebalance(parent)
+        if child is parent and parent.height == height and parent.max_score == max_score:
+            return root  # nothing above this node can change
+    return child
+
+def build_avl_from_sorted(products, scores=None):
+    # Groups equal prices into buckets, then links the middle bucket of every slice as its root.
+    if scores is None:
+        scores = [compute_rating_price_score(p) for p in products]
+    nodes = []
+    for product, score in zip(products, scores):
+        if nodes and nodes[-1].price == product.price:
+            nodes[-1].add(product, score)
+        else:
+            nodes.append(AVLNode(product, score))
+
+    def build(lo, hi):
+        if lo > hi:
+            return None
+        mid = (lo + hi) // 2
+        node = nodes[mid]
+        node.left = build(lo, mid - 1)
+        node.right = build(mid + 1, hi)
+        update_height(node)
+        return node
+
+    return build(0, len(nodes) - 1)
 
 def range_query_avl(node, min_price, max_price, results):
+    stack = []
+    while stack or node:
+        if node:
+            stack.append(node)
+            node = node.left if min_price < node.price else None
+        else:
+            node = stack.pop()
+            if min_price <= node.price <= max_price:
+                results.extend(node.products)
+            node = node.right if max_price > node.price else None
+
+def top_k_in_range(root, min_price, max_price, k):
+    # Best-first search over the O(log n) subtrees and boundary nodes that cover the range,
+    # expanding whichever candidate has the highest score bound until k products are out.
+    heap = []
+    counter = itertools.count()
+
+    def push_subtree(node):
+        if node:
+            heapq.heappush(heap, (-node.max_score, next(counter), node, None))
+
+    def push_bucket(node, pos=0):
+        heapq.heappush(heap, (node.neg_scores[pos], next(counter), node, pos))
+
+    node = root
+    while node and not min_price <= node.price <= max_price:
+        node = node.right if node.price < min_price else node.left
     if not node:
-        return
-    if min_price < node.product.price:
-        range_query_avl(node.left, min_price, max_price, results)
-    if min_price <= node.product.price <= max_price:
-        results.append(node.product)
-    if max_price > node.product.price:
-        range_query_avl(node.right, min_price, max_price, results)
\ No newline at end of file
+        return []
+    push_bucket(node)
+    left = node.left
+    while left:
+        if left.price >= min_price:
+            push_bucket(left)
+            push_subtree(left.right)
+            left = left.left
+        else:
+            left = left.right
+    right = node.right
+    while right:
+        if right.price <= max_price:
+            push_bucket(right)
+            push_subtree(right.left)
+            right = right.right
+        else:
+            right = right.left
+
+    top = []
+    while heap and len(top) < k:
+        neg_score, _, node, pos = heapq.heappop(heap)
+        if pos is None:
+            push_bucket(node)
+            push_subtree(node.left)
+            push_subtree(node.right)
+            continue
+        top.append((-neg_score, node.products[pos]))
+        if pos + 1 < len(node.products):
+            push_bucket(node, pos + 1)
+    return top
@@ -0,0 +1,129 @@
+# modules/batch.py
+import asyncio
+import json
+import logging
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from modules.async_engine import async_search_many
+from modules.cache import cached_scrape
+from modules.profiling import tag_thread
+from modules.rate_limit import TokenBucket
+from modules.search import SCRAPERS
+from modules.sorting import get_rating_price_recommendations, impute_na_ratings
+from modules.matching import dedupe_products
+from config import (
+    MAX_RESULTS_PER_SITE, BATCH_CONCURRENCY, BATCH_SITE_RATES, BATCH_PROGRESS_EVERY, MATCH_ENABLED,
+    ASYNC_QUERY_CONCURRENCY
+)
+
+def read_queries(stream):
+    seen = set()
+    for line in stream:
+        query = line.strip()
+        if query and not query.startswith("#") and query not in seen:
+            seen.add(query)
+            yield query
+
+def rank_query_results(query, site_products, errors):
+    all_products = [p for products in site_products.values() for p in products]
+    result = {
+        "query": query,
+        "total_products": len(all_products),
+        "sites": {site: len(products) for site, products in site_products.items()},
+        "errors": errors
+    }
+    if all_products and MATCH_ENABLED:
+        all_products = dedupe_products(all_products)
+        result["unique_products"] = len(all_products)
+    if all_products:
+        na_count, avg_rating = impute_na_ratings(all_products)
+        top_products, valid_count = get_rating_price_recommendations(all_products)
+        result.update({
+            "imputed_ratings": na_count,
+            "average_rating": round(avg_rating, 2),
+            "valid_products": valid_count,
+            "recommendations": [p.to_dict() for p in top_products]
+        })
+    else:
+        result["recommendations"] = []
+    return result
+
+class BatchProgress:
+    def __init__(self):
+        self.completed = 0
+        self.start = time.monotonic()
+
+    def record(self):
+        self.completed += 1
+        if self.completed % BATCH_PROGRESS_EVERY == 0:
+            elapsed = time.monotonic() - self.start
+            logging.info(f"Batch progress: {self.completed} queries, {self.completed / elapsed * 60:.1f} queries/min")
+
+    def finish(self):
+        elapsed = time.monotonic() - self.start
+        rate = self.completed / elapsed * 60 if elapsed > 0 else 0.0
+        logging.info(f"Batch finished: {self.completed} queries in {elapsed:.1f}s ({rate:.1f} queries/min)")
+        return self.completed, rate
+
+def write_result(out, result):
+    out.write(json.dumps(result, ensure_ascii=False) + "\n")
+    out.flush()
+
+def scrape_site(site, query, limiter, max_results):
+    # The token is taken inside the scraper, so cache hits are served without waiting on the limiter.
+    def scrape(query, max_results):
+        limiter.acquire()
+        return SCRAPERS[site](query, max_results)
+
+    with tag_thread(site):
+        return cached_scrape(site, scrape, query, max_results)
+
+def run_batch(queries, out, concurrency=BATCH_CONCURRENCY, site_rates=BATCH_SITE_RATES,
+              max_results=MAX_RESULTS_PER_SITE):
+    limiters = {site: TokenBucket(site_rates.get(site, 1.0)) for site in SCRAPERS}
+    pending = defaultdict(lambda: len(SCRAPERS))
+    site_products = defaultdict(dict)
+    errors = defaultdict(dict)
+    progress = BatchProgress()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        future_to_job = {}
+        for query in queries:
+            for site in SCRAPERS:
+                future = executor.submit(scrape_site, site, query, limiters[site], max_results)
+                future_to_job[future] = (query, site)
+        logging.info(f"Scheduled {len(future_to_job)} site searches for {len(future_to_job) // len(SCRAPERS)} queries")
+        for future in as_completed(future_to_job):
+            query, site = future_to_job.pop(future)
+            try:
+                site_products[query][site] = future.result()
+            except Exception as e:
+                logging.error(f"Error in {site} for '{query}': {e}")
+                site_products[query][site] = []
+                errors[query][site] = str(e)
+            pending[query] -= 1
+            if pending[query]:
+                continue
+            result = rank_query_results(query, site_products.pop(query), errors.pop(query, {}))
+            del pending[query]
+            write_result(out, result)
+            progress.record()
+    return progress.finish()
+
+def run_batch_async(queries, out, concurrency=ASYNC_QUERY_CONCURRENCY, site_rates=BATCH_SITE_RATES,
+                    max_results=MAX_RESULTS_PER_SITE):
+    # Runs every query on one event loop and one pooled aiohttp session, under the same
+    # per-site rate limits as run_batch. concurrency counts queries in flight, not site searches.
+    limiters = {site: TokenBucket(site_rates.get(site, 1.0)) for site in SCRAPERS}
+    progress = BatchProgress()
+
+    def on_result(query, search_result):
+        site_products = {site: [] for site in search_result.completed_sites + search_result.failed_sites}
+        for product in search_result.products:
+            site_products.setdefault(product.site, []).append(product)
+        write_result(out, rank_query_results(query, site_products, search_result.errors))
+        progress.record()
+
+    # No search deadline, as in run_batch: waiting on the rate limiters must not count against it.
+    asyncio.run(async_search_many(list(queries), max_results, concurrency, on_result, limiters, deadline=None))
+    return progress.finish()
@@ -0,0 +1,78 @@
+# modules/browser_extract.py
+import logging
+import re
+from modules.utilities import scroll_page, get_page_soup, parse_price
+from modules.product import Product
+from modules.metrics import timer
+from config import BROWSER_EXTRACTION
+
+# Runs a site's field map over its product containers inside the page and returns one
+# small object per product. Each field lists fallback selectors; "selector@attr" reads
+# an attribute instead of the text, and the first non-empty value wins.
+EXTRACT_PRODUCTS_JS = """
+const [containerSelector, fields, maxResults] = arguments;
+const read = (item, spec) => {
+    const [selector, attr] = spec.split("@");
+    const el = selector ? item.querySelector(selector) : item;
+    if (!el) return null;
+    const value = attr ? el.getAttribute(attr) : el.textContent;
+    return value && value.trim() ? value.trim() : null;
+};
+const rows = [];
+for (const item of document.querySelectorAll(containerSelector)) {
+    if (rows.length >= maxResults) break;
+    const row = {};
+    for (const [field, specs] of Object.entries(fields)) {
+        for (const spec of specs) {
+            const value = read(item, spec);
+            if (value !== null) { row[field] = value; break; }
+        }
+    }
+    rows.push(row);
+}
+return rows;
+"""
+
+RATING_RE = re.compile(r'\d*\.?\d+')
+STAR_WIDTH_RE = re.compile(r'width:\s*(\d+)%')
+
+def row_to_product(row, site, build_link=None):
+    name = row.get("name", "N/A")
+    href = row.get("link", "")
+    link = build_link(href) if build_link else href or "N/A"
+    price = parse_price(row.get("price", "N/A"))
+    old_price = parse_price(row.get("strike", "N/A"))
+    discount = "N/A"
+    if old_price != "N/A" and price != "N/A" and old_price > price:
+        discount = f"{round(((old_price-price)/old_price)*100)}% off"
+    elif "off" in row.get("discount", "").lower():
+        discount = row["discount"]
+    rating = "N/A"
+    match = RATING_RE.search(row.get("rating", ""))
+    if match:
+        rating = match.group()
+    else:
+        match = STAR_WIDTH_RE.search(row.get("stars", ""))
+        if match:
+            rating = str(round(int(match.group(1)) / 20, 1))
+    if name == "N/A" or price == "N/A":
+        return None
+    return Product(name, price, discount, rating, link, site)
+
+def extract_products(driver, site, container_selector, fields, max_results, build_link=None):
+    rows = driver.execute_script(EXTRACT_PRODUCTS_JS, container_selector, fields, max_results) or []
+    products = [row_to_product(row, site, build_link) for row in rows]
+    return [product for product in products if product][:max_results]
+
+def browse_products(driver, site, container_selector, fields, parse_products, max_results, build_link=None):
+    # Scrolls until enough containers load, then pulls products out in one script call.
+    # Falls back to shipping the containers' HTML to the site parser if that finds nothing.
+    with timer("scroll", site):
+        scroll_page(driver, target_selector=container_selector, target_count=max_results)
+    if BROWSER_EXTRACTION == "js":
+        with timer("browser_extract", site):
+            products = extract_products(driver, site, container_selector, fields, max_results, build_link)
+        if products:
+            return products
+        logging.info(f"{site}: in-page extraction found no products, parsing container HTML")
+    return parse_products(get_page_soup(driver, container_selector, site), max_results)
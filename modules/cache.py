@@ -0,0 +1,160 @@
+# modules/cache.py
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from config import (
+    CACHE_ENABLED, CACHE_PATH, CACHE_TTLS, CACHE_DEFAULT_TTL, CACHE_STALE_TTL,
+    CACHE_MAX_ENTRIES, CACHE_MAX_BYTES, MAX_RESULTS_PER_SITE
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    site TEXT NOT NULL,
+    query TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    size INTEGER NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+"""
+
+def normalize_query(query):
+    return " ".join(query.lower().split())
+
+def get_ttl(site):
+    return CACHE_TTLS.get(site, CACHE_DEFAULT_TTL)
+
+class SearchCache:
+    def __init__(self, path=CACHE_PATH, max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+
+    def make_key(self, site, query, page=1, kind="products"):
+        return f"{kind}:{site}:{page}:{normalize_query(query)}"
+
+    def get(self, site, query, page=1, kind="products"):
+        key = self.make_key(site, query, page, kind)
+        with self._lock:
+            row = self._conn.execute("SELECT created, payload FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None, None
+            self._conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        try:
+            return pickle.loads(row[1]), time.time() - row[0]
+        except Exception as e:
+            logging.warning(f"Dropping unreadable cache entry {key}: {e}")
+            self.delete(site, query, page, kind)
+            return None, None
+
+    def put(self, site, query, value, page=1, kind="products"):
+        key = self.make_key(site, query, page, kind)
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, site, normalize_query(query), page, kind, now, now, len(payload), payload)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def delete(self, site, query, page=1, kind="products"):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (self.make_key(site, query, page, kind),))
+            self._conn.commit()
+
+    def _evict(self):
+        count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY accessed").fetchall():
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            count -= 1
+            total -= size
+            evicted += 1
+        logging.info(f"Evicted {evicted} least recently used cache entries")
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+_cache = None
+_cache_lock = threading.Lock()
+_refreshing = set()
+
+def get_search_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SearchCache()
+        return _cache
+
+def refresh_in_background(site, scraper, query, max_results):
+    key = (site, normalize_query(query))
+    with _cache_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def refresh():
+        try:
+            products = scraper(query, max_results)
+            if products:
+                get_search_cache().put(site, query, {"requested": max_results, "products": products})
+        except Exception as e:
+            logging.warning(f"Background refresh of {site} '{query}' failed: {e}")
+        finally:
+            with _cache_lock:
+                _refreshing.discard(key)
+
+    threading.Thread(target=refresh, daemon=True).start()
+
+def get_cached_products(site, scraper, query, max_results=MAX_RESULTS_PER_SITE):
+    # Returns the cached products, or None when the query has to be scraped. A stale entry is
+    # served while scraper refreshes it on a background thread.
+    if not CACHE_ENABLED:
+        return None
+    entry, age = get_search_cache().get(site, query)
+    if entry is not None and entry["requested"] >= max_results:
+        ttl = get_ttl(site)
+        if age <= ttl:
+            logging.info(f"{site}: cache hit for '{query}' ({age:.0f}s old)")
+            return entry["products"][:max_results]
+        if age <= ttl + CACHE_STALE_TTL:
+            logging.info(f"{site}: serving stale cache for '{query}' ({age:.0f}s old), refreshing")
+            refresh_in_background(site, scraper, query, max_results)
+            return entry["products"][:max_results]
+    return None
+
+def store_products(site, query, products, max_results=MAX_RESULTS_PER_SITE):
+    if CACHE_ENABLED and products:
+        get_search_cache().put(site, query, {"requested": max_results, "products": products})
+
+def cached_scrape(site, scraper, query, max_results=MAX_RESULTS_PER_SITE):
+    products = get_cached_products(site, scraper, query, max_results)
+    if products is None:
+        products = scraper(query, max_results)
+        store_products(site, query, products, max_results)
+    return products
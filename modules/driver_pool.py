@@ -0,0 +1,173 @@
+# modules/driver_pool.py
+import atexit
+import itertools
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from modules.utilities import setup_driver
+from config import USER_AGENTS, DRIVER_POOL_SIZE, DRIVER_MAX_PAGES, DRIVER_CHECKOUT_TIMEOUT
+
+class PooledDriver:
+    def __init__(self, driver, user_agent):
+        self.driver = driver
+        self.user_agent = user_agent
+        self.pages = 0
+
+class DriverPool:
+    def __init__(self, size=DRIVER_POOL_SIZE, max_pages=DRIVER_MAX_PAGES,
+                 checkout_timeout=DRIVER_CHECKOUT_TIMEOUT):
+        self.size = size
+        self.max_pages = max_pages
+        self.checkout_timeout = checkout_timeout
+        self._idle = []  # used as a LIFO stack, which keeps the warmest browsers in use
+        # Checked-out drivers are tracked so close() can quit those an abandoned search
+        # attempt still holds; daemon threads are never joined, so they would outlive the process.
+        self._in_use = set()
+        # One condition guards the idle stack, the checked-out set and the created count, so a
+        # freed slot or a returned driver wakes a waiting checkout.
+        self._cond = threading.Condition()
+        self._created = 0
+        self._closed = False
+        self._user_agents = itertools.cycle(random.sample(USER_AGENTS, len(USER_AGENTS)))
+
+    def _create(self, site="all"):
+        with self._cond:
+            user_agent = next(self._user_agents)
+        logging.info(f"Starting pooled Chrome driver ({self._created}/{self.size})")
+        return PooledDriver(setup_driver(user_agent, site), user_agent)
+
+    def _reserve_slot(self):
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Driver pool is closed")
+            if self._created < self.size:
+                self._created += 1
+                return True
+            return False
+
+    def _release_slot(self):
+        with self._cond:
+            self._created -= 1
+            self._cond.notify()
+
+    def _discard(self, entry):
+        try:
+            entry.driver.quit()
+        except Exception as e:
+            logging.warning(f"Error quitting pooled driver: {e}")
+        self._release_slot()
+
+    def _is_healthy(self, entry):
+        try:
+            entry.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _take_idle_or_slot(self, deadline):
+        # Returns an idle driver, or None once a slot for a new driver has been reserved.
+        with self._cond:
+            while True:
+                if self._idle:
+                    return self._idle.pop()
+                if self._reserve_slot():
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"No pooled driver available within {self.checkout_timeout}s")
+                self._cond.wait(remaining)
+
+    def _mark_in_use(self, entry):
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Driver pool is closed")
+            self._in_use.add(entry)
+        return entry
+
+    def checkout(self, site="all"):
+        deadline = time.monotonic() + self.checkout_timeout
+        while True:
+            entry = self._take_idle_or_slot(deadline)
+            if entry is None:
+                try:
+                    entry = self._create(site)
+                except Exception:
+                    self._release_slot()
+                    raise
+                healthy = True
+            else:
+                healthy = self._is_healthy(entry)
+            if healthy:
+                try:
+                    return self._mark_in_use(entry)
+                except RuntimeError:
+                    self._discard(entry)
+                    raise
+            logging.warning("Pooled driver failed health check — replacing it")
+            self._discard(entry)
+
+    def checkin(self, entry, healthy=True):
+        with self._cond:
+            if entry not in self._in_use:
+                return  # close() already quit it
+            self._in_use.discard(entry)
+        entry.pages += 1
+        if self._closed or not healthy or entry.pages >= self.max_pages:
+            if healthy and entry.pages >= self.max_pages:
+                logging.info(f"Recycling pooled driver after {entry.pages} pages")
+            self._discard(entry)
+            return
+        try:
+            entry.driver.delete_all_cookies()
+            entry.driver.get("about:blank")
+        except Exception:
+            self._discard(entry)
+            return
+        with self._cond:
+            self._idle.append(entry)
+            self._cond.notify()
+
+    @contextmanager
+    def driver(self, site="all"):
+        # site only labels the driver_startup metric when a new browser has to be started.
+        entry = self.checkout(site)
+        try:
+            yield entry.driver
+        except Exception:
+            self.checkin(entry, healthy=self._is_healthy(entry))
+            raise
+        else:
+            self.checkin(entry)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            entries = self._idle + list(self._in_use)
+            self._idle = []
+            self._in_use.clear()
+            self._cond.notify_all()
+        for entry in entries:
+            self._discard(entry)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_driver_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool()
+            atexit.register(_pool.close)
+        return _pool
+
+def pooled_driver(site="all"):
+    return get_driver_pool().driver(site)
+
+def shutdown_driver_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
@@ -0,0 +1,73 @@
+# modules/http_fetch.py
+import logging
+import threading
+from collections import defaultdict
+import requests
+from modules.parsing import make_soup
+from modules.metrics import timer
+from modules.cache import get_search_cache, get_ttl
+from config import get_random_user_agent, TIMEOUT, HTTP_FIRST, BROWSER_FALLBACK, CACHE_RAW_HTML
+
+_path_stats = defaultdict(lambda: {"http": 0, "browser": 0, "failed": 0})
+_path_lock = threading.Lock()
+
+def get_http_headers(referer="https://www.google.com/"):
+    return {
+        "User-Agent": get_random_user_agent(),
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-IN,en;q=0.9",
+        "Referer": referer,
+        "DNT": "1"
+    }
+
+def fetch_html(url, site):
+    if CACHE_RAW_HTML:
+        html, age = get_search_cache().get(site, url, page=0, kind="html")
+        if html is not None and age <= get_ttl(site):
+            return html
+    try:
+        with timer("http_fetch", site):
+            res = requests.get(url, headers=get_http_headers(), timeout=TIMEOUT)
+        if res.status_code == 200:
+            if CACHE_RAW_HTML:
+                get_search_cache().put(site, url, res.text, page=0, kind="html")
+            return res.text
+        logging.info(f"{site} HTTP fetch returned {res.status_code} for {url}")
+    except Exception as e:
+        logging.info(f"{site} HTTP fetch failed for {url}: {e}")
+    return None
+
+def fetch_soup(url, site, parse_only=None):
+    html = fetch_html(url, site)
+    return make_soup(html, parse_only=parse_only, site=site) if html else None
+
+def record_fetch_path(site, path):
+    with _path_lock:
+        _path_stats[site][path] += 1
+
+def get_fetch_path_stats():
+    with _path_lock:
+        return {site: dict(counts) for site, counts in _path_stats.items()}
+
+def scrape_http_first(site, http_scraper, browser_scraper, query, max_results):
+    if HTTP_FIRST:
+        try:
+            products = http_scraper(query, max_results)
+        except Exception as e:
+            logging.warning(f"{site} HTTP path failed: {e}")
+            products = []
+        if products:
+            logging.info(f"{site}: served {len(products)} products over HTTP")
+            record_fetch_path(site, "http")
+            return products
+        if not BROWSER_FALLBACK:
+            record_fetch_path(site, "failed")
+            return products
+        logging.info(f"{site}: HTTP path returned no products, falling back to browser")
+    try:
+        products = browser_scraper(query, max_results)
+    except Exception:
+        record_fetch_path(site, "failed")
+        raise
+    record_fetch_path(site, "browser" if products else "failed")
+    return products
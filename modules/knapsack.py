@@ -1,39 +1,105 @@
 # modules/knapsack.py
+import math
+import numpy as np
 from modules.sorting import compute_rating_price_score
+from modules.metrics import timed
+from config import KNAPSACK_PRICE_GRANULARITY
 
-def budget_knapsack_dp(products, budget, max_items=5):
-    valid_products = [p for p in products if p.price != "N/A"]
-    n = len(valid_products)
-    if n == 0:
-        return [], 0, 0
-    dp = [[[0 for _ in range(max_items + 1)] 
-           for _ in range(budget + 1)] 
-           for _ in range(n + 1)]
-    choice = [[[0 for _ in range(max_items + 1)] 
-               for _ in range(budget + 1)] 
-               for _ in range(n + 1)]
-    for i in range(1, n + 1):
-        price = valid_products[i-1].price
-        score = compute_rating_price_score(valid_products[i-1])
-        for w in range(budget + 1):
-            for k in range(max_items + 1):
-                dp[i][w][k] = dp[i-1][w][k]
-                choice[i][w][k] = 0
-                if price <= w and k >= 1:
-                    new_score = dp[i-1][w-price][k-1] + score
-                    if new_score > dp[i][w][k]:
-                        dp[i][w][k] = new_score
-                        choice[i][w][k] = 1
+def get_choice_bit(choice, i, k, w):
+    return (choice[i, k, w >> 3] >> (7 - (w & 7))) & 1
+
+def knapsack_by_weight(weights, scores, capacity, max_items):
+    n = len(weights)
+    # dp[k][w] is the best score using at most k items costing at most w, rolled over items.
+    # choice keeps one bit per (item, k, w) packed eight budgets to a byte for reconstruction.
+    dp = np.zeros((max_items + 1, capacity + 1))
+    choice = np.zeros((n, max_items + 1, (capacity + 8) // 8), dtype=np.uint8)
+    taken = np.zeros(capacity + 1, dtype=bool)
+    for i, weight in enumerate(weights):
+        if weight > capacity:
+            continue
+        for k in range(max_items, 0, -1):
+            new_score = dp[k - 1, :capacity + 1 - weight] + scores[i]
+            better = new_score > dp[k, weight:]
+            if not better.any():
+                continue
+            dp[k, weight:] = np.where(better, new_score, dp[k, weight:])
+            taken[:weight] = False
+            taken[weight:] = better
+            choice[i, k] = np.packbits(taken)
     selected = []
-    total_cost = 0
-    i, w, k = n, budget, max_items
-    while i > 0 and w > 0 and k > 0:
-        if choice[i][w][k] == 1:
-            product = valid_products[i-1]
-            product.temp_score = compute_rating_price_score(product)
-            selected.append(product)
-            total_cost += product.price
-            w -= product.price
+    i, w, k = n - 1, capacity, max_items
+    while i >= 0 and w > 0 and k > 0:
+        if get_choice_bit(choice, i, k, w):
+            selected.append(i)
+            w -= weights[i]
+            k -= 1
+        i -= 1
+    return selected[::-1], float(dp[max_items, capacity])
+
+def knapsack_by_profit(costs, profits, budget, max_items):
+    n = len(costs)
+    max_profit = sum(sorted(profits, reverse=True)[:max_items])
+    # cost[k][q] is the cheapest way to reach scaled profit exactly q with at most k items.
+    cost = np.full((max_items + 1, max_profit + 1), np.inf)
+    cost[:, 0] = 0
+    choice = np.zeros((n, max_items + 1, (max_profit + 8) // 8), dtype=np.uint8)
+    taken = np.zeros(max_profit + 1, dtype=bool)
+    for i, profit in enumerate(profits):
+        if profit <= 0:
+            continue
+        for k in range(max_items, 0, -1):
+            new_cost = cost[k - 1, :max_profit + 1 - profit] + costs[i]
+            better = new_cost < cost[k, profit:]
+            if not better.any():
+                continue
+            cost[k, profit:] = np.where(better, new_cost, cost[k, profit:])
+            taken[:profit] = False
+            taken[profit:] = better
+            choice[i, k] = np.packbits(taken)
+    q = int(np.flatnonzero(cost[max_items] <= budget)[-1])
+    selected = []
+    i, k = n - 1, max_items
+    while i >= 0 and q > 0 and k > 0:
+        if get_choice_bit(choice, i, k, q):
+            selected.append(i)
+            q -= profits[i]
             k -= 1
         i -= 1
-    return selected[::-1], dp[n][budget][max_items], total_cost
\ No newline at end of file
+    return selected[::-1]
+
+def fptas_knapsack(products, scores, budget, max_items, epsilon):
+    # Scaling by eps * best / max_items loses under eps * best <= eps * OPT, since every
+    # candidate fits on its own and a selection holds at most max_items products.
+    candidates = [i for i, p in enumerate(products) if p.price <= budget and scores[i] > 0]
+    if not candidates:
+        return []
+    scale = epsilon * max(scores[i] for i in candidates) / max_items
+    profits = [int(scores[i] // scale) for i in candidates]
+    costs = [products[i].price for i in candidates]
+    return [candidates[i] for i in knapsack_by_profit(costs, profits, budget, max_items)]
+
+@timed("knapsack")
+def budget_knapsack_dp(products, budget, max_items=5, granularity=KNAPSACK_PRICE_GRANULARITY, epsilon=None):
+    valid_products = [p for p in products if p.is_valid]
+    if not valid_products:
+        return [], 0, 0
+    scores = [compute_rating_price_score(p) for p in valid_products]
+    if epsilon:
+        indices = fptas_knapsack(valid_products, scores, budget, max_items, epsilon)
+        total_score = sum(scores[i] for i in indices)
+    elif granularity > 1:
+        # Rounding prices up keeps every quantized selection within the real budget.
+        weights = [math.ceil(p.price / granularity) for p in valid_products]
+        indices, _ = knapsack_by_weight(weights, scores, budget // granularity, max_items)
+        total_score = sum(scores[i] for i in indices)
+    else:
+        indices, total_score = knapsack_by_weight([p.price for p in valid_products], scores, budget, max_items)
+    selected = []
+    total_cost = 0
+    for i in indices:
+        product = valid_products[i]
+        product.temp_score = scores[i]
+        selected.append(product)
+        total_cost += product.price
+    return selected, total_score, total_cost
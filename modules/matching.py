@@ -0,0 +1,126 @@
+# modules/matching.py
+import re
+import zlib
+from collections import defaultdict
+import numpy as np
+from modules.metrics import timed
+from config import MATCH_NUM_PERM, MATCH_BANDS, MATCH_THRESHOLD, MATCH_MAX_PRICE_RATIO
+
+MERSENNE_PRIME = (1 << 31) - 1
+STOPWORDS = {"a", "an", "and", "the", "for", "with", "of", "in", "by", "to", "on", "pack", "combo", "new", "latest"}
+UNIT_RE = re.compile(r"(\d+(?:\.\d+)?)\s+(gb|tb|mb|mah|ml|l|kg|g|cm|mm|inch|inches|w|hz|pcs|pc)\b")
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+
+_rng = np.random.default_rng(20240601)
+PERM_A = _rng.integers(1, MERSENNE_PRIME, MATCH_NUM_PERM, dtype=np.uint64)
+PERM_B = _rng.integers(0, MERSENNE_PRIME, MATCH_NUM_PERM, dtype=np.uint64)
+
+def normalize_title(name):
+    # Lowercased tokens with units glued to their numbers ("128 GB" -> "128gb") and filler words dropped.
+    text = UNIT_RE.sub(r"\1\2", name.lower().replace("&", " and "))
+    return frozenset(token for token in TOKEN_RE.findall(text) if token not in STOPWORDS)
+
+def minhash_signatures(titles, chunk=4096):
+    # One (titles x MATCH_NUM_PERM) matrix: every token is hashed under all permutations at once and
+    # each title keeps its per-permutation minimum. Token hashes stay below 2^31, so (a*x + b)
+    # never overflows uint64 before the modulo. Titles must be non-empty.
+    signatures = np.empty((len(titles), MATCH_NUM_PERM), dtype=np.uint64)
+    for start in range(0, len(titles), chunk):
+        block = titles[start:start + chunk]
+        hashes = np.fromiter(
+            (zlib.crc32(token.encode()) & MERSENNE_PRIME for title in block for token in title), dtype=np.uint64
+        )
+        offsets = np.cumsum([0] + [len(title) for title in block[:-1]])
+        values = (hashes[:, None] * PERM_A + PERM_B) % MERSENNE_PRIME
+        signatures[start:start + len(block)] = np.minimum.reduceat(values, offsets, axis=0)
+    return signatures
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+def spec_tokens(tokens):
+    return frozenset(token for token in tokens if any(ch.isdigit() for ch in token))
+
+def specs_conflict(a_tokens, b_tokens, a_specs, b_specs):
+    # Model numbers and specs ("m14", "128gb") must not conflict: one title may omit some,
+    # but "iphone 14" and "iphone 15" are different products however similar the rest is.
+    return bool(a_specs - b_tokens and b_specs - a_tokens)
+
+def is_match(a_tokens, b_tokens, a_specs, b_specs, a_price, b_price, threshold=MATCH_THRESHOLD):
+    if max(a_price, b_price) > MATCH_MAX_PRICE_RATIO * min(a_price, b_price):
+        return False
+    if specs_conflict(a_tokens, b_tokens, a_specs, b_specs):
+        return False
+    return jaccard(a_tokens, b_tokens) >= threshold
+
+class UnionFind:
+    # Each root also holds the merged tokens and specs of its cluster, so a chain of pairwise
+    # matches ("128gb" ~ generic ~ "256gb") cannot join listings whose specs conflict.
+    def __init__(self, tokens, specs):
+        self.parent = list(range(len(tokens)))
+        self.tokens = list(tokens)
+        self.specs = list(specs)
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i, j):
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i == root_j:
+            return True
+        if specs_conflict(self.tokens[root_i], self.tokens[root_j], self.specs[root_i], self.specs[root_j]):
+            return False
+        root, child = min(root_i, root_j), max(root_i, root_j)
+        self.parent[child] = root
+        self.tokens[root] |= self.tokens[child]
+        self.specs[root] |= self.specs[child]
+        self.tokens[child] = self.specs[child] = None
+        return True
+
+def cluster_products(products, threshold=MATCH_THRESHOLD, bands=MATCH_BANDS):
+    # MinHash-LSH: titles whose signatures agree on every row of some band share a bucket.
+    # Each bucket member is verified against the bucket's first member only, which keeps the
+    # work linear in the total bucket size; matches missed there usually meet in another band.
+    tokens = [normalize_title(p.name) for p in products]
+    specs = [spec_tokens(title) for title in tokens]
+    rows = MATCH_NUM_PERM // bands
+    clusters = UnionFind(tokens, specs)
+    buckets = defaultdict(list)
+    titled = [i for i, title in enumerate(tokens) if title]
+    signatures = minhash_signatures([tokens[i] for i in titled]) if titled else None
+    for band in range(bands):
+        band_keys = signatures[:, band * rows:(band + 1) * rows] if titled else ()
+        for i, key in zip(titled, band_keys):
+            buckets[(band, key.tobytes())].append(i)
+    for members in buckets.values():
+        first = members[0]
+        for i in members[1:]:
+            if clusters.find(i) != clusters.find(first) and is_match(
+                    tokens[first], tokens[i], specs[first], specs[i], products[first].price, products[i].price, threshold):
+                clusters.union(first, i)
+    groups = defaultdict(list)
+    for i in range(len(products)):
+        groups[clusters.find(i)].append(products[i])
+    return list(groups.values())
+
+def make_canonical(group):
+    # The cheapest listing stands for the cluster and carries every offer, cheapest first.
+    offers = sorted(group, key=lambda p: p.price)
+    canonical = offers[0]
+    if len(offers) > 1:
+        canonical.offers = offers
+        if canonical.rating_value == 0:
+            rated = next((p for p in offers if p.rating_value > 0), None)
+            if rated:
+                canonical.rating = rated.rating
+    return canonical
+
+@timed("dedupe")
+def dedupe_products(products, threshold=MATCH_THRESHOLD):
+    # Products without a price cannot be compared, so they pass through untouched.
+    valid = [p for p in products if p.is_valid]
+    unique = [make_canonical(group) for group in cluster_products(valid, threshold)]
+    return unique + [p for p in products if not p.is_valid]
@@ -0,0 +1,125 @@
+# modules/metrics.py
+import bisect
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from config import METRICS_ENABLED, METRICS_BUCKETS
+
+class Histogram:
+    # Cumulative-bucket latency histogram in seconds, in the Prometheus layout.
+    __slots__ = ("bounds", "counts", "count", "total", "lock")
+
+    def __init__(self, bounds=METRICS_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # the last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, seconds):
+        i = bisect.bisect_left(self.bounds, seconds)
+        with self.lock:
+            self.counts[i] += 1
+            self.count += 1
+            self.total += seconds
+
+    def quantile(self, q):
+        # Upper bound of the bucket holding the q-th observation, like histogram_quantile without interpolation.
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "count": self.count,
+                "sum": self.total,
+                "mean": self.total / self.count if self.count else 0.0,
+                "p50": self.quantile(0.5),
+                "p95": self.quantile(0.95),
+                "p99": self.quantile(0.99),
+                "buckets": dict(zip([*map(str, self.bounds), "+Inf"], self.counts))
+            }
+
+class MetricsRegistry:
+    def __init__(self):
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    def histogram(self, stage, site):
+        key = (stage, site)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            with self.lock:
+                histogram = self.histograms.setdefault(key, Histogram())
+        return histogram
+
+    def observe(self, stage, site, seconds):
+        self.histogram(stage, site).observe(seconds)
+
+    def reset(self):
+        with self.lock:
+            self.histograms.clear()
+
+    def to_json(self):
+        stages = {}
+        for (stage, site), histogram in sorted(self.histograms.items()):
+            stages.setdefault(stage, {})[site] = histogram.snapshot()
+        return json.dumps(stages, indent=2)
+
+    def to_prometheus(self):
+        lines = [
+            "# HELP search_stage_seconds Time spent per search stage and retailer.",
+            "# TYPE search_stage_seconds histogram"
+        ]
+        for (stage, site), histogram in sorted(self.histograms.items()):
+            with histogram.lock:
+                counts = list(histogram.counts)
+                count, total = histogram.count, histogram.total
+            labels = f'stage="{stage}",site="{site}"'
+            cumulative = 0
+            for bound, bucket_count in zip([*map(str, histogram.bounds), "+Inf"], counts):
+                cumulative += bucket_count
+                lines.append(f'search_stage_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"search_stage_seconds_sum{{{labels}}} {total}")
+            lines.append(f"search_stage_seconds_count{{{labels}}} {count}")
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
+
+@contextmanager
+def timer(stage, site="all"):
+    if not METRICS_ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.observe(stage, site, time.perf_counter() - start)
+
+def timed(stage, site="all"):
+    def decorate(fn):
+        if not METRICS_ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                metrics.observe(stage, site, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+def write_metrics(path):
+    # .json gets the JSON summary; anything else gets the Prometheus text exposition format.
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(metrics.to_json() if path.endswith(".json") else metrics.to_prometheus())
@@ -0,0 +1,102 @@
+# modules/parsing.py
+import importlib.util
+import logging
+import re
+from functools import lru_cache
+from bs4 import BeautifulSoup, SoupStrainer
+from modules.metrics import timer
+from config import HTML_PARSER
+
+BACKENDS = ("selectolax", "lxml", "html.parser")
+
+def is_backend_available(backend):
+    if backend == "html.parser":
+        return True
+    module = "selectolax" if backend == "selectolax" else backend
+    return importlib.util.find_spec(module) is not None
+
+def available_backends():
+    return [backend for backend in BACKENDS if is_backend_available(backend)]
+
+@lru_cache(maxsize=None)
+def resolve_backend(backend=HTML_PARSER):
+    if backend == "auto":
+        # selectolax is fastest but goes through a compatibility wrapper, so lxml is preferred.
+        return "lxml" if is_backend_available("lxml") else "html.parser"
+    if not is_backend_available(backend):
+        logging.warning(f"HTML parser '{backend}' is not installed, falling back to html.parser")
+        return "html.parser"
+    return backend
+
+def make_strainer(name, attrs):
+    # While parsing, SoupStrainer sees the raw class string, so match class names as whole words.
+    attrs = {
+        key: re.compile(rf"(^|\s){re.escape(value)}(\s|$)") if key == "class" and isinstance(value, str) else value
+        for key, value in attrs.items()
+    }
+    return SoupStrainer(name, attrs)
+
+def make_soup(html, backend=None, parse_only=None, site="all"):
+    # parse_only is a (tag name, attrs) pair; bs4 backends then build only those subtrees.
+    # selectolax parses whole pages faster than bs4 strains them, so it ignores the hint.
+    backend = resolve_backend(backend or HTML_PARSER)
+    with timer("parse_html", site):
+        if backend == "selectolax":
+            from selectolax.lexbor import LexborHTMLParser
+            return SelectolaxTag(LexborHTMLParser(html).root)
+        if parse_only:
+            return BeautifulSoup(html, backend, parse_only=make_strainer(*parse_only))
+        return BeautifulSoup(html, backend)
+
+def to_css(name=None, attrs=None, class_=None, **kwargs):
+    selector = name or "*"
+    if class_:
+        selector += "".join(f".{cls}" for cls in class_.split())
+    for key, value in {**(attrs or {}), **kwargs}.items():
+        if value is True:
+            selector += f"[{key}]"
+        else:
+            selector += f'[{key}="{value}"]'
+    return selector
+
+class SelectolaxTag:
+    # The subset of the BeautifulSoup Tag API the scrapers use, backed by a selectolax node.
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+    def select(self, selector):
+        return [SelectolaxTag(node) for node in self.node.css(selector)]
+
+    def select_one(self, selector):
+        node = self.node.css_first(selector)
+        return SelectolaxTag(node) if node is not None else None
+
+    def find_all(self, name=None, attrs=None, class_=None, **kwargs):
+        return self.select(to_css(name, attrs, class_, **kwargs))
+
+    def find(self, name=None, attrs=None, class_=None, **kwargs):
+        return self.select_one(to_css(name, attrs, class_, **kwargs))
+
+    @property
+    def text(self):
+        return self.node.text(deep=True)
+
+    def get_text(self, separator="", strip=False):
+        return self.node.text(deep=True, separator=separator, strip=strip)
+
+    @property
+    def attrs(self):
+        return {key: value if value is not None else "" for key, value in self.node.attributes.items()}
+
+    def get(self, key, default=None):
+        return self.attrs.get(key, default)
+
+    def __getitem__(self, key):
+        return self.attrs[key]
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self.select_one(name)
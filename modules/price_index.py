@@ -0,0 +1,42 @@
+# modules/price_index.py
+from operator import attrgetter
+from modules.avl_tree import insert_avl, build_avl_from_sorted, range_query_avl, top_k_in_range
+from modules.sorting import compute_rating_price_score
+from config import MAX_RESULTS_PER_SITE
+
+get_price = attrgetter("price")
+
+class PriceIndex:
+    def __init__(self, products=(), score=compute_rating_price_score):
+        self.root = None
+        self.score = score
+        self._size = 0
+        self.extend(products)
+
+    def __len__(self):
+        return self._size
+
+    def add(self, product):
+        if not product.is_valid:
+            return
+        self.root = insert_avl(self.root, product, self.score(product))
+        self._size += 1
+
+    def extend(self, products):
+        new_products = [p for p in products if p.is_valid]
+        if len(new_products) <= self._size:
+            for product in new_products:
+                self.add(product)
+            return
+        # Large batches are cheaper to merge and bulk-load than to insert one at a time.
+        all_products = sorted(self.range(float("-inf"), float("inf")) + new_products, key=get_price)
+        self.root = build_avl_from_sorted(all_products, [self.score(p) for p in all_products])
+        self._size = len(all_products)
+
+    def range(self, min_price, max_price):
+        results = []
+        range_query_avl(self.root, min_price, max_price, results)
+        return results
+
+    def top_k(self, min_price, max_price, k=MAX_RESULTS_PER_SITE):
+        return top_k_in_range(self.root, min_price, max_price, k)
@@ -1,5 +1,32 @@
 # modules/product.py
+import math
+import re
+
+def parse_discount(discount):
+    if discount == "N/A":
+        return 0
+    try:
+        return int(re.sub(r"[^\d]", "", discount))
+    except ValueError:
+        return 0
+
+def parse_rating(rating):
+    if rating == "N/A":
+        return 0.0
+    try:
+        return float(rating)
+    except ValueError:
+        return 0.0
+
 class Product:
+    # score/temp_score are only set on ranked products, and offers only on products that
+    # de-duplication merged with other listings, so hasattr() still tells them apart.
+    __slots__ = (
+        "name", "price", "discount", "link", "site", "_rating",
+        "price_value", "rating_value", "discount_value", "is_valid",
+        "score", "temp_score", "offers"
+    )
+
     def __init__(self, name, price, discount, rating, link, site="Unknown"):
         self.name = name
         self.price = price
@@ -7,10 +34,41 @@ class Product:
         self.rating = rating
         self.link = link
         self.site = site
+        self.is_valid = price != "N/A"
+        self.price_value = float(price) if self.is_valid else math.nan
+        self.discount_value = parse_discount(discount)
+
+    @property
+    def rating(self):
+        return self._rating
+
+    @rating.setter
+    def rating(self, rating):
+        self._rating = rating
+        self.rating_value = parse_rating(rating)
+
+    def to_dict(self):
+        data = {
+            "site": self.site,
+            "name": self.name,
+            "price": self.price,
+            "discount": self.discount,
+            "rating": self.rating,
+            "link": self.link
+        }
+        if hasattr(self, "score"):
+            data["score"] = round(self.score, 4)
+        if hasattr(self, "offers"):
+            data["offers"] = [{"site": p.site, "price": p.price, "link": p.link} for p in self.offers]
+        return data
 
     def __repr__(self):
+        other_offers = ""
+        if hasattr(self, "offers"):
+            other_offers = "Also at: " + ", ".join(f"{p.site} ₹{p.price}" for p in self.offers[1:]) + "\n"
         return (f"[{self.site}] {self.name}\n"
                 f"Price: ₹{self.price}\n"
                 f"Discount: {self.discount}\n"
                 f"Rating: {self.rating}\n"
-                f"Link: {self.link}\n{'-'*60}")
\ No newline at end of file
+                f"{other_offers}"
+                f"Link: {self.link}\n{'-'*60}")
@@ -0,0 +1,74 @@
+# modules/product_table.py
+import numpy as np
+from modules.metrics import timed
+from config import MAX_RESULTS_PER_SITE
+
+class ProductTable:
+    def __init__(self, products):
+        self.products = list(products)
+        n = len(self.products)
+        self.price = np.fromiter((p.price_value for p in self.products), dtype=np.float64, count=n)
+        self.rating = np.fromiter((p.rating_value for p in self.products), dtype=np.float64, count=n)
+        self.discount = np.fromiter((p.discount_value for p in self.products), dtype=np.float64, count=n)
+        self.sites = sorted({p.site for p in self.products})
+        site_ids = {site: i for i, site in enumerate(self.sites)}
+        self.site_id = np.fromiter((site_ids[p.site] for p in self.products), dtype=np.int16, count=n)
+        self.valid_index = np.flatnonzero(~np.isnan(self.price))
+        self._scores = None
+
+    def __len__(self):
+        return len(self.products)
+
+    @property
+    def valid_count(self):
+        return len(self.valid_index)
+
+    @property
+    def rating_price_score(self):
+        if self._scores is None:
+            price = np.maximum(self.price, 1)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                self._scores = self.rating ** 2 / np.log10(price)
+        return self._scores
+
+    @timed("rank")
+    def top_k(self, keys, k):
+        # Indices of the k smallest keys among valid products; ties keep scrape order like the heap version.
+        idx = self.valid_index
+        k = min(k, len(idx))
+        if k <= 0:
+            return idx[:0]
+        keys = keys[idx]
+        if k < len(idx):
+            kth = np.partition(keys, k - 1)[k - 1]
+            candidates = np.flatnonzero((keys <= kth) | np.isnan(kth))
+        else:
+            candidates = np.arange(len(idx))
+        order = np.lexsort((candidates, keys[candidates]))[:k]
+        return idx[candidates[order]]
+
+    def _select(self, keys, max_results):
+        return [self.products[i] for i in self.top_k(keys, max_results)]
+
+    def sort_by_price_asc(self, max_results=MAX_RESULTS_PER_SITE):
+        return self._select(self.price, max_results)
+
+    def sort_by_price_desc(self, max_results=MAX_RESULTS_PER_SITE):
+        return self._select(-self.price, max_results)
+
+    def sort_by_rating(self, max_results=MAX_RESULTS_PER_SITE):
+        return self._select(-self.rating, max_results)
+
+    def sort_by_discount(self, max_results=MAX_RESULTS_PER_SITE):
+        return self._select(-self.discount, max_results)
+
+    def get_rating_price_recommendations(self, max_results=MAX_RESULTS_PER_SITE):
+        if not self.valid_count:
+            return [], 0
+        scores = self.rating_price_score
+        top_products = []
+        for i in self.top_k(-scores, max_results):
+            product = self.products[i]
+            product.score = float(scores[i])
+            top_products.append(product)
+        return top_products, self.valid_count
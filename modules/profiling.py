@@ -0,0 +1,125 @@
+# modules/profiling.py
+import cProfile
+import logging
+import os
+import pstats
+import re
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from config import PROFILE_SAMPLE_INTERVAL
+
+_thread_sites = {}
+_active_profiler = None
+
+@contextmanager
+def tag_thread(site):
+    # Marks the current thread as working for a site until the block exits, so samples and
+    # per-thread cProfile stats are attributed to it.
+    ident = threading.get_ident()
+    previous = _thread_sites.get(ident)
+    _thread_sites[ident] = site
+    profiler = _active_profiler
+    thread_profile = profiler.start_thread() if profiler else None
+    try:
+        yield
+    finally:
+        if thread_profile:
+            profiler.stop_thread(site, thread_profile)
+        if previous is None:
+            _thread_sites.pop(ident, None)
+        else:
+            _thread_sites[ident] = previous
+
+def frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class SamplingProfiler:
+    # Walks every thread's stack each interval and counts collapsed stacks, rooted at the
+    # thread's site tag (or its name), in the format flamegraph.pl and speedscope read.
+    def __init__(self, interval=PROFILE_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="sampling-profiler", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def run(self):
+        own = threading.get_ident()
+        while not self.stop_event.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(frame_label(frame.f_code))
+                    frame = frame.f_back
+                root = _thread_sites.get(ident) or re.sub(r"[-_]\d+", "", names.get(ident, "unknown"))
+                stack.append(root)
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start_thread(self):
+        return None
+
+    def stop(self, path):
+        self.stop_event.set()
+        self.thread.join()
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        logging.info(f"Wrote {sum(self.stacks.values())} samples to {path} (collapsed stacks)")
+
+class CProfileProfiler:
+    # cProfile sees only the thread it is enabled in, so each tagged site run gets its own
+    # profile, merged per site when the run ends.
+    def __init__(self):
+        self.main_profile = cProfile.Profile()
+        self.site_profiles = {}
+        self.lock = threading.Lock()
+
+    def start(self):
+        self.main_profile.enable()
+
+    def start_thread(self):
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+ profiles are interpreter-wide, so the main profile already covers this thread.
+            return None
+        return profile
+
+    def stop_thread(self, site, profile):
+        profile.disable()
+        with self.lock:
+            self.site_profiles.setdefault(site, []).append(profile)
+
+    def stop(self, path):
+        self.main_profile.disable()
+        stats = pstats.Stats(self.main_profile)
+        with self.lock:
+            for site, profiles in self.site_profiles.items():
+                site_stats = pstats.Stats(*profiles)
+                site_stats.dump_stats(f"{path}.{site}")
+                stats.add(site_stats)
+        stats.dump_stats(path)
+        if self.site_profiles:
+            logging.info(f"Wrote cProfile stats to {path} (per-site: {path}.<site>)")
+        else:
+            logging.info(f"Wrote cProfile stats to {path} (no per-site split on Python 3.12+)")
+
+@contextmanager
+def profile_run(path, mode="sample"):
+    global _active_profiler
+    profiler = CProfileProfiler() if mode == "cprofile" else SamplingProfiler()
+    _active_profiler = profiler
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        _active_profiler = None
+        profiler.stop(path)
@@ -0,0 +1,55 @@
+# modules/rate_limit.py
+import asyncio
+import threading
+import time
+
+class TokenBucket:
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens=1):
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def _take_or_wait(self, tokens):
+        # Takes the tokens and returns 0, or returns how long to wait before they are available.
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens=1, cancel=None):
+        # Blocks until the tokens are taken. With a cancel Event, gives up without taking them
+        # once it is set and returns False.
+        while True:
+            if cancel is not None and cancel.is_set():
+                return False
+            wait = self._take_or_wait(tokens)
+            if not wait:
+                return True
+            if cancel is None:
+                time.sleep(wait)
+            else:
+                cancel.wait(wait)
+
+    async def acquire_async(self, tokens=1):
+        while True:
+            wait = self._take_or_wait(tokens)
+            if not wait:
+                return
+            await asyncio.sleep(wait)
@@ -2,10 +2,23 @@
 import time
 import random
 import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import requests
-from bs4 import BeautifulSoup
-from config import get_random_user_agent, TIMEOUT, MAX_RESULTS_PER_SITE
+from modules.parsing import make_soup
+from config import (
+    get_random_user_agent, TIMEOUT, MAX_RESULTS_PER_SITE, AMAZON_PARALLEL_PAGES,
+    AMAZON_MAX_CONCURRENCY, AMAZON_REQUESTS_PER_SECOND, AMAZON_EXTRA_PAGES, SITE_BASE_URLS
+)
 from modules.product import Product
+from modules.metrics import timed, timer
+from modules.profiling import tag_thread
+from modules.rate_limit import TokenBucket
+
+AMAZON_CONTAINER = ("div", {"data-component-type": "s-search-result"})
+ASIN_RE = re.compile(r"/dp/([A-Z0-9]{10})")
+amazon_rate_limiter = TokenBucket(AMAZON_REQUESTS_PER_SECOND)
 
 def get_amazon_headers():
     return {
@@ -17,17 +30,18 @@ def get_amazon_headers():
 
 def get_amazon_search_url(query, page=1):
     query_enc = requests.utils.quote(query)
-    return f"https://www.amazon.in/s?k={query_enc}&page={page}"
+    return f"{SITE_BASE_URLS['Amazon']}/s?k={query_enc}&page={page}"
 
 def fetch_amazon_html(url):
     try:
-        res = requests.get(url, headers=get_amazon_headers(), timeout=TIMEOUT)
+        with timer("http_fetch", "Amazon"):
+            res = requests.get(url, headers=get_amazon_headers(), timeout=TIMEOUT)
         if res.status_code == 503:
             logging.info("Amazon returned 503 — retrying...")
             time.sleep(random.uniform(3, 6))
             res = requests.get(url, headers=get_amazon_headers(), timeout=TIMEOUT)
         if res.status_code == 200:
-            return BeautifulSoup(res.text, "html.parser")
+            return make_soup(res.text, parse_only=AMAZON_CONTAINER, site="Amazon")
         else:
             logging.warning(f"Failed with status {res.status_code} for {url}")
             return None
@@ -35,6 +49,7 @@ def fetch_amazon_html(url):
         logging.error(f"Error fetching {url}: {e}")
         return None
 
+@timed("extract", "Amazon")
 def parse_amazon_products(soup, max_results=MAX_RESULTS_PER_SITE):
     products = []
     if not soup:
@@ -46,7 +61,7 @@ def parse_amazon_products(soup, max_results=MAX_RESULTS_PER_SITE):
             title_elem = item.h2
             name = title_elem.text.strip() if title_elem else "N/A"
             link_tag = item.find("a", class_="a-link-normal s-no-outline")
-            link = "https://www.amazon.in" + link_tag["href"] if link_tag else "N/A"
+            link = SITE_BASE_URLS["Amazon"] + link_tag["href"] if link_tag else "N/A"
             price_elem = item.find("span", class_="a-price-whole")
             price_text = price_elem.text.strip().replace(",", "") if price_elem else "N/A"
             price = int(price_text) if price_text.isdigit() else "N/A"
@@ -71,7 +86,58 @@ def parse_amazon_products(soup, max_results=MAX_RESULTS_PER_SITE):
             continue
     return products[:max_results]
 
+def get_amazon_product_key(product):
+    match = ASIN_RE.search(product.link)
+    return match.group(1) if match else product.link
+
+def scrape_amazon_parallel(query, max_results=MAX_RESULTS_PER_SITE):
+    # Pages are fetched concurrently but merged strictly in page order, skipping repeated ASINs.
+    max_pages = (max_results + 9) // 10 + AMAZON_EXTRA_PAGES
+    stop = threading.Event()
+
+    def fetch_page(page):
+        # Workers still waiting once enough products are in must not drain the shared bucket
+        # other Amazon searches draw from.
+        if not amazon_rate_limiter.acquire(cancel=stop) or stop.is_set():
+            return []
+        logging.info(f"Scraping Amazon page {page}...")
+        with tag_thread("Amazon"):
+            page_products = parse_amazon_products(fetch_amazon_html(get_amazon_search_url(query, page)), max_results)
+        logging.info(f"Found {len(page_products)} products on page {page}")
+        return page_products
+
+    all_products = []
+    seen = set()
+    ready = {}
+    next_page = 1
+    executor = ThreadPoolExecutor(max_workers=AMAZON_MAX_CONCURRENCY)
+    try:
+        future_to_page = {executor.submit(fetch_page, page): page for page in range(1, max_pages + 1)}
+        pending = set(future_to_page)
+        while pending and len(all_products) < max_results:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    ready[future_to_page[future]] = future.result()
+                except Exception as e:
+                    logging.warning(f"Amazon page {future_to_page[future]} failed: {e}")
+                    ready[future_to_page[future]] = []
+            while next_page in ready and len(all_products) < max_results:
+                for product in ready.pop(next_page):
+                    key = get_amazon_product_key(product)
+                    if key not in seen:
+                        seen.add(key)
+                        all_products.append(product)
+                next_page += 1
+    finally:
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+    return all_products[:max_results]
+
+@timed("scrape", "Amazon")
 def scrape_amazon(query, max_results=MAX_RESULTS_PER_SITE):
+    if AMAZON_PARALLEL_PAGES and max_results > 10:
+        return scrape_amazon_parallel(query, max_results)
     all_products = []
     max_pages = (max_results + 9) // 10
     for page in range(1, max_pages + 1):
@@ -1,123 +1,167 @@
 # modules/scrapers/flipkart.py
 import logging
 import re
-from modules.utilities import setup_driver, smart_scroll, parse_price
+from modules.utilities import parse_price
+from modules.browser_extract import browse_products
+from modules.driver_pool import pooled_driver
+from modules.http_fetch import fetch_html, scrape_http_first
+from modules.parsing import make_soup
+from modules.selector_plan import SelectorPlan, has_text
 from modules.product import Product
-from config import MAX_RESULTS_PER_SITE
+from modules.metrics import timed, timer
+from config import MAX_RESULTS_PER_SITE, SITE_BASE_URLS
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 
-def scrape_flipkart(query, max_results=MAX_RESULTS_PER_SITE):
-    products = []
-    driver = setup_driver()
+FLIPKART_CONTAINER = ("div", {"data-id": True})
+RATING_RE = re.compile(r'\d*\.?\d+')
+
+def has_rating(tag):
+    return bool(RATING_RE.search(tag.text.strip()))
+
+# Fallback chains per field, newest layout first. Each page pins whichever selector its
+# first items matched (see SelectorPlan), so most items cost one lookup per field.
+FLIPKART_SELECTORS = {
+    "name": ([
+        "a.wjcEIp", "div.KzDlHZ", "a.WKTcLC", "div.syl9yP",
+        "div._2WkVRV", "a.IRpwTa", "a.s1Q9rs",
+        "div._4rR01T", "a._2rpwqI", "div.tUxRFH",
+        "a.CGtC98", "div._2B099V"
+    ], has_text),
+    "price": (["div._30jeq3", "div._3I9_wc", "div._25b18c", "div.Nx9bqj", "div.hl05eU"], None),
+    "original_price": (["div._3Ay6Sb", "div._2_R_DZ", "div._3I9_wc._2p6lqe", "div.yRaY8j"], None),
+    "discount": (["div._3Ay6Sb._31Dcoz", "div._3xFhiH", "div.UkUFwK span"], None),
+    "rating": ([
+        "div.XQDdHH", "div._3LWZlK", "span._1lRcqv",
+        "div.CGtC98", "div._2c2kV-", "div.Rsc7Yb"
+    ], has_rating),
+    "stars": (["div.tV2F7c", "div._1fV99m"], None)
+}
+
+# The same chains as an in-page field map for browser extraction.
+FLIPKART_FIELDS = {
+    "name": FLIPKART_SELECTORS["name"][0],
+    "link": ["a[href]@href"],
+    "price": FLIPKART_SELECTORS["price"][0],
+    "strike": FLIPKART_SELECTORS["original_price"][0],
+    "discount": FLIPKART_SELECTORS["discount"][0],
+    "rating": FLIPKART_SELECTORS["rating"][0],
+    "stars": [f"{selector} span[style]@style" for selector in FLIPKART_SELECTORS["stars"][0]]
+}
+
+def build_flipkart_link(href):
+    if href.startswith("/"):
+        return SITE_BASE_URLS["Flipkart"] + href
+    elif href.startswith("http"):
+        return href
+    else:
+        return SITE_BASE_URLS["Flipkart"] + "/" + href if href else "N/A"
+
+def make_flipkart_plans():
+    return {
+        field: SelectorPlan("Flipkart", field, selectors, accept)
+        for field, (selectors, accept) in FLIPKART_SELECTORS.items()
+    }
+
+def get_flipkart_search_url(query):
     query = query.replace(" ", "%20")
-    url = f"https://www.flipkart.com/search?q={query}"
-    logging.info(f"Scraping Flipkart: {url}")
-    
-    try:
-        driver.get(url)
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "div[data-id]"))
-        )
-        soup = smart_scroll(driver)
-        items = soup.select("div[data-id]")
-        if not items:
-            items = soup.select("div._1AtVbE")
-        if not items:
-            items = soup.select("div._2kHMtA")
-        logging.info(f"Found {len(items)} product containers")
-        items = items[:max_results]
+    return f"{SITE_BASE_URLS['Flipkart']}/search?q={query}"
 
-        for idx, item in enumerate(items, 1):
-            try:
-                name = "N/A"
-                name_tag = item.select_one("a.wjcEIp")
-                if name_tag and name_tag.text.strip():
-                    name = name_tag.text.strip()
-                else:
-                    name_selectors = [
-                        "div.KzDlHZ", "a.WKTcLC", "div.syl9yP", 
-                        "div._2WkVRV", "a.IRpwTa", "a.s1Q9rs",
-                        "div._4rR01T", "a._2rpwqI", "div.tUxRFH",
-                        "a.CGtC98", "div._2B099V"
-                    ]
-                    for selector in name_selectors:
-                        name_tag = item.select_one(selector)
-                        if name_tag and name_tag.text.strip():
-                            name = name_tag.text.strip()
-                            if len(name) > 10:
-                                break
-                if name == "N/A":
-                    links = item.find_all("a", href=True)
-                    for link in links:
-                        text = link.get_text(strip=True)
-                        if text and 15 < len(text) < 200:
-                            name = text
-                            break
-                link_tag = item.find("a", href=True)
-                link_href = link_tag['href'] if link_tag else ""
-                if link_href.startswith("/"):
-                    link = "https://www.flipkart.com" + link_href
-                elif link_href.startswith("http"):
-                    link = link_href
-                else:
-                    link = "https://www.flipkart.com/" + link_href if link_href else "N/A"
-                price_tag = (item.select_one("div._30jeq3") or 
-                            item.select_one("div._3I9_wc") or
-                            item.select_one("div._25b18c") or
-                            item.select_one("div.Nx9bqj") or
-                            item.select_one("div.hl05eU"))
-                price = parse_price(price_tag.text.strip() if price_tag else "N/A")
-                original_price_tag = (item.select_one("div._3Ay6Sb") or 
-                                     item.select_one("div._2_R_DZ") or
-                                     item.select_one("div._3I9_wc._2p6lqe") or
-                                     item.select_one("div.yRaY8j"))
-                discount = "N/A"
-                if original_price_tag:
-                    old_price = parse_price(original_price_tag.text.strip())
-                    if old_price != "N/A" and price != "N/A" and old_price > price:
-                        discount = f"{round(((old_price-price)/old_price)*100)}% off"
-                if discount == "N/A":
-                    discount_tag = (item.select_one("div._3Ay6Sb._31Dcoz") or 
-                                   item.select_one("div._3xFhiH") or
-                                   item.select_one("div.UkUFwK span"))
-                    if discount_tag:
-                        discount_text = discount_tag.text.strip()
-                        if "off" in discount_text.lower():
-                            discount = discount_text
-                rating = "N/A"
-                rating_selectors = [
-                    "div.XQDdHH", "div._3LWZlK", "span._1lRcqv",
-                    "div.CGtC98", "div._2c2kV-", "div.Rsc7Yb"
-                ]
-                for selector in rating_selectors:
-                    rating_tag = item.select_one(selector)
-                    if rating_tag and rating_tag.text.strip():
-                        rating_text = rating_tag.text.strip()
-                        match = re.search(r'\d*\.?\d+', rating_text)
+@timed("extract", "Flipkart")
+def parse_flipkart_products(soup, max_results=MAX_RESULTS_PER_SITE):
+    products = []
+    if not soup:
+        return products
+    items = soup.select("div[data-id]")
+    if not items:
+        items = soup.select("div._1AtVbE")
+    if not items:
+        items = soup.select("div._2kHMtA")
+    logging.info(f"Found {len(items)} product containers")
+    items = items[:max_results]
+
+    plans = make_flipkart_plans()
+    for idx, item in enumerate(items, 1):
+        try:
+            name = "N/A"
+            name_tag = plans["name"].find(item)
+            if name_tag:
+                name = name_tag.text.strip()
+            else:
+                links = item.find_all("a", href=True)
+                for link in links:
+                    text = link.get_text(strip=True)
+                    if text and 15 < len(text) < 200:
+                        name = text
+                        break
+            link_tag = item.find("a", href=True)
+            link = build_flipkart_link(link_tag['href'] if link_tag else "")
+            price_tag = plans["price"].find(item)
+            price = parse_price(price_tag.text.strip() if price_tag else "N/A")
+            original_price_tag = plans["original_price"].find(item)
+            discount = "N/A"
+            if original_price_tag:
+                old_price = parse_price(original_price_tag.text.strip())
+                if old_price != "N/A" and price != "N/A" and old_price > price:
+                    discount = f"{round(((old_price-price)/old_price)*100)}% off"
+            if discount == "N/A":
+                discount_tag = plans["discount"].find(item)
+                if discount_tag:
+                    discount_text = discount_tag.text.strip()
+                    if "off" in discount_text.lower():
+                        discount = discount_text
+            rating = "N/A"
+            rating_tag = plans["rating"].find(item)
+            if rating_tag:
+                rating = RATING_RE.search(rating_tag.text.strip()).group()
+            else:
+                star_container = plans["stars"].find(item)
+                if star_container:
+                    star_span = star_container.find("span", style=True)
+                    if star_span and "width" in star_span.get("style", ""):
+                        match = re.search(r'width:(\d+)%', star_span["style"])
                         if match:
-                            rating = match.group()
-                            break
-                if rating == "N/A":
-                    star_container = item.select_one("div.tV2F7c") or item.select_one("div._1fV99m")
-                    if star_container:
-                        star_span = star_container.find("span", style=True)
-                        if star_span and "width" in star_span.get("style", ""):
-                            match = re.search(r'width:(\d+)%', star_span["style"])
-                            if match:
-                                width = int(match.group(1))
-                                rating = str(round(width / 20, 1))
-                                logging.info(f"Estimated rating {rating} from star width for {name}")
-                if rating == "N/A":
-                    logging.warning(f"No rating found for product: {name}")
-                if name != "N/A" and price != "N/A":
-                    products.append(Product(name, price, discount, rating, link, "Flipkart"))
-            except Exception as e:
-                logging.warning(f"Error parsing Flipkart item {idx}: {e}")
-                continue
-    except Exception as e:
-        logging.error(f"Error loading Flipkart page: {e}")
-    finally:
-        driver.quit()
-    return products[:max_results]
\ No newline at end of file
+                            width = int(match.group(1))
+                            rating = str(round(width / 20, 1))
+                            logging.info(f"Estimated rating {rating} from star width for {name}")
+            if rating == "N/A":
+                logging.warning(f"No rating found for product: {name}")
+            if name != "N/A" and price != "N/A":
+                products.append(Product(name, price, discount, rating, link, "Flipkart"))
+        except Exception as e:
+            logging.warning(f"Error parsing Flipkart item {idx}: {e}")
+            continue
+    return products[:max_results]
+
+def parse_flipkart_html(html, max_results=MAX_RESULTS_PER_SITE):
+    if not html:
+        return []
+    products = parse_flipkart_products(make_soup(html, parse_only=FLIPKART_CONTAINER, site="Flipkart"), max_results)
+    if not products:
+        # Older layouts have no data-id containers; give the full-page fallbacks a chance.
+        products = parse_flipkart_products(make_soup(html, site="Flipkart"), max_results)
+    return products
+
+def scrape_flipkart_http(query, max_results=MAX_RESULTS_PER_SITE):
+    return parse_flipkart_html(fetch_html(get_flipkart_search_url(query), "Flipkart"), max_results)
+
+def scrape_flipkart_browser(query, max_results=MAX_RESULTS_PER_SITE):
+    url = get_flipkart_search_url(query)
+    logging.info(f"Scraping Flipkart: {url}")
+    with pooled_driver("Flipkart") as driver:
+        try:
+            with timer("page_load", "Flipkart"):
+                driver.get(url)
+                WebDriverWait(driver, 20).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "div[data-id]"))
+                )
+            return browse_products(driver, "Flipkart", "div[data-id]", FLIPKART_FIELDS,
+                                   parse_flipkart_products, max_results, build_flipkart_link)
+        except Exception as e:
+            logging.error(f"Error loading Flipkart page: {e}")
+            return []
+
+@timed("scrape", "Flipkart")
+def scrape_flipkart(query, max_results=MAX_RESULTS_PER_SITE):
+    return scrape_http_first("Flipkart", scrape_flipkart_http, scrape_flipkart_browser, query, max_results)
@@ -1,53 +1,121 @@
 # modules/scrapers/myntra.py
+import json
 import logging
-from modules.utilities import setup_driver, smart_scroll, parse_price
+import re
+from modules.utilities import parse_price
+from modules.browser_extract import browse_products
+from modules.driver_pool import pooled_driver
+from modules.http_fetch import fetch_html, scrape_http_first
 from modules.product import Product
-from config import MAX_RESULTS_PER_SITE
+from modules.metrics import timed, timer
+from config import MAX_RESULTS_PER_SITE, SITE_BASE_URLS
+from modules.parsing import make_soup
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 
-def scrape_myntra(query, max_results=MAX_RESULTS_PER_SITE):
-    products = []
-    driver = setup_driver()
+MYNTRA_CONTAINER = ("li", {"class": "product-base"})
+MYNTRA_FIELDS = {
+    "name": ["h4.product-product"],
+    "link": ["a@href"],
+    "price": ["span.product-discountedPrice"],
+    "strike": ["span.product-strike"],
+    "rating": ["div.product-ratingsContainer span"]
+}
+MYNTRA_STATE_RE = re.compile(r"window\.__myx\s*=\s*(\{.*?\})\s*;?\s*</script>", re.DOTALL)
+
+def get_myntra_search_url(query):
     query = query.replace(" ", "-")
-    url = f"https://www.myntra.com/{query}"
-    logging.info(f"Scraping Myntra: {url}")
-    driver.get(url)
+    return f"{SITE_BASE_URLS['Myntra']}/{query}"
 
+def build_myntra_link(link_href):
+    if link_href.startswith("/"):
+        return SITE_BASE_URLS["Myntra"] + link_href
+    elif link_href.startswith("http"):
+        return link_href
+    else:
+        return SITE_BASE_URLS["Myntra"] + "/" + link_href
+
+@timed("extract", "Myntra")
+def parse_myntra_state(html, max_results=MAX_RESULTS_PER_SITE):
+    products = []
+    match = MYNTRA_STATE_RE.search(html or "")
+    if not match:
+        return products
     try:
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "li.product-base"))
-        )
-        soup = smart_scroll(driver)
-        items = soup.select("li.product-base")[:max_results]
-
-        for item in items:
-            try:
-                name_tag = item.select_one("h4.product-product")
-                name = name_tag.text.strip() if name_tag else "N/A"
-                link_tag = item.select_one("a")
-                link_href = link_tag.get("href", "") if link_tag else ""
-                if link_href.startswith("/"):
-                    link = "https://www.myntra.com" + link_href
-                elif link_href.startswith("http"):
-                    link = link_href
-                else:
-                    link = "https://www.myntra.com/" + link_href
-                price_tag = item.select_one("span.product-discountedPrice")
-                price = parse_price(price_tag.text.strip() if price_tag else "N/A")
-                original_price_tag = item.select_one("span.product-strike")
-                discount = "N/A"
-                if original_price_tag:
-                    old_price = parse_price(original_price_tag.text.strip())
-                    if old_price != "N/A" and price != "N/A" and old_price > price:
-                        discount = f"{round(((old_price-price)/old_price)*100)}% off"
-                rating_tag = item.select_one("div.product-ratingsContainer span")
-                rating = rating_tag.text.strip() if rating_tag else "N/A"
-                if name != "N/A" and price != "N/A":
-                    products.append(Product(name, price, discount, rating, link, "Myntra"))
-            except Exception:
-                continue
-    finally:
-        driver.quit()
-    return products[:max_results]
\ No newline at end of file
+        state = json.loads(match.group(1))
+        items = state["searchData"]["results"]["products"]
+    except (ValueError, KeyError, TypeError) as e:
+        logging.info(f"Myntra state blob not usable: {e}")
+        return products
+    for item in items[:max_results]:
+        try:
+            name = item.get("productName") or item.get("product") or "N/A"
+            link = build_myntra_link(item.get("landingPageUrl", ""))
+            price = parse_price(str(item.get("price", "N/A")))
+            old_price = parse_price(str(item.get("mrp", "N/A")))
+            discount = "N/A"
+            if old_price != "N/A" and price != "N/A" and old_price > price:
+                discount = f"{round(((old_price-price)/old_price)*100)}% off"
+            rating = item.get("rating")
+            rating = f"{float(rating):.1f}" if rating else "N/A"
+            if name != "N/A" and price != "N/A":
+                products.append(Product(name, price, discount, rating, link, "Myntra"))
+        except Exception:
+            continue
+    return products[:max_results]
+
+@timed("extract", "Myntra")
+def parse_myntra_products(soup, max_results=MAX_RESULTS_PER_SITE):
+    products = []
+    if not soup:
+        return products
+    items = soup.select("li.product-base")[:max_results]
+    for item in items:
+        try:
+            name_tag = item.select_one("h4.product-product")
+            name = name_tag.text.strip() if name_tag else "N/A"
+            link_tag = item.select_one("a")
+            link = build_myntra_link(link_tag.get("href", "") if link_tag else "")
+            price_tag = item.select_one("span.product-discountedPrice")
+            price = parse_price(price_tag.text.strip() if price_tag else "N/A")
+            original_price_tag = item.select_one("span.product-strike")
+            discount = "N/A"
+            if original_price_tag:
+                old_price = parse_price(original_price_tag.text.strip())
+                if old_price != "N/A" and price != "N/A" and old_price > price:
+                    discount = f"{round(((old_price-price)/old_price)*100)}% off"
+            rating_tag = item.select_one("div.product-ratingsContainer span")
+            rating = rating_tag.text.strip() if rating_tag else "N/A"
+            if name != "N/A" and price != "N/A":
+                products.append(Product(name, price, discount, rating, link, "Myntra"))
+        except Exception:
+            continue
+    return products[:max_results]
+
+def parse_myntra_html(html, max_results=MAX_RESULTS_PER_SITE):
+    if not html:
+        return []
+    products = parse_myntra_state(html, max_results)
+    if not products:
+        products = parse_myntra_products(make_soup(html, parse_only=MYNTRA_CONTAINER, site="Myntra"), max_results)
+    return products
+
+def scrape_myntra_http(query, max_results=MAX_RESULTS_PER_SITE):
+    return parse_myntra_html(fetch_html(get_myntra_search_url(query), "Myntra"), max_results)
+
+def scrape_myntra_browser(query, max_results=MAX_RESULTS_PER_SITE):
+    url = get_myntra_search_url(query)
+    logging.info(f"Scraping Myntra: {url}")
+    with pooled_driver("Myntra") as driver:
+        with timer("page_load", "Myntra"):
+            driver.get(url)
+            WebDriverWait(driver, 20).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "li.product-base"))
+            )
+        return browse_products(driver, "Myntra", "li.product-base", MYNTRA_FIELDS,
+                               parse_myntra_products, max_results, build_myntra_link)
+
+@timed("scrape", "Myntra")
+def scrape_myntra(query, max_results=MAX_RESULTS_PER_SITE):
+    return scrape_http_first("Myntra", scrape_myntra_http, scrape_myntra_browser, query, max_results)
@@ -1,63 +1,93 @@
 # modules/scrapers/snapdeal.py
 import logging
 import re
-from modules.utilities import setup_driver, smart_scroll, parse_price
+from modules.utilities import parse_price
+from modules.browser_extract import browse_products
+from modules.driver_pool import pooled_driver
+from modules.http_fetch import fetch_soup, scrape_http_first
 from modules.product import Product
-from config import MAX_RESULTS_PER_SITE
+from modules.metrics import timed, timer
+from config import MAX_RESULTS_PER_SITE, SITE_BASE_URLS
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 
-def scrape_snapdeal(query, max_results=MAX_RESULTS_PER_SITE):
-    products = []
-    driver = setup_driver()
+SNAPDEAL_CONTAINER = ("div", {"class": "product-tuple-listing"})
+SNAPDEAL_FIELDS = {
+    "name": ["p.product-title"],
+    "link": ["a[href]@href"],
+    "price": ["span.lfloat.product-price"],
+    "strike": ["span.lfloat.product-desc-price.strike"],
+    "rating": [
+        "span.rating-num", "div.rating-stars span", "span.rat-text",
+        "div.product-rating span", "span.ratingText", "p.ratingText"
+    ],
+    "stars": ["span.filled-stars@style"]
+}
+
+def get_snapdeal_search_url(query):
     query = query.replace(" ", "%20")
-    url = f"https://www.snapdeal.com/search?keyword={query}"
-    logging.info(f"Scraping Snapdeal: {url}")
-    driver.get(url)
+    return f"{SITE_BASE_URLS['Snapdeal']}/search?keyword={query}"
 
-    try:
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "div.product-tuple-listing"))
-        )
-        soup = smart_scroll(driver)
-        items = soup.select("div.product-tuple-listing")[:max_results]
+@timed("extract", "Snapdeal")
+def parse_snapdeal_products(soup, max_results=MAX_RESULTS_PER_SITE):
+    products = []
+    if not soup:
+        return products
+    items = soup.select("div.product-tuple-listing")[:max_results]
+    for item in items:
+        try:
+            name_tag = item.select_one("p.product-title")
+            name = name_tag.text.strip() if name_tag else "N/A"
+            link_tag = item.find("a", href=True)
+            link = link_tag['href'] if link_tag else "N/A"
+            price_tag = item.select_one("span.lfloat.product-price")
+            price = parse_price(price_tag.text.strip() if price_tag else "N/A")
+            original_price_tag = item.select_one("span.lfloat.product-desc-price.strike")
+            discount = "N/A"
+            if original_price_tag:
+                old_price = parse_price(original_price_tag.text.strip())
+                if old_price != "N/A" and price != "N/A" and old_price > price:
+                    discount = f"{round(((old_price-price)/old_price)*100)}% off"
+            rating = "N/A"
+            for selector in [
+                "span.rating-num", "div.rating-stars span", "span.rat-text",
+                "div.product-rating span", "span.ratingText", "p.ratingText"
+            ]:
+                rating_tag = item.select_one(selector)
+                if rating_tag and rating_tag.text.strip():
+                    match = re.search(r'\d*\.?\d+', rating_tag.text.strip())
+                    if match:
+                        rating = match.group()
+                        break
+            if rating == "N/A":
+                stars = item.select_one("span.filled-stars")
+                if stars and "style" in stars.attrs:
+                    match = re.search(r'width:(\d+)%', stars["style"])
+                    if match:
+                        rating = str(round(int(match.group(1))/20, 1))
+            if name != "N/A" and price != "N/A":
+                products.append(Product(name, price, discount, rating, link, "Snapdeal"))
+        except Exception:
+            continue
+    return products[:max_results]
 
-        for item in items:
-            try:
-                name_tag = item.select_one("p.product-title")
-                name = name_tag.text.strip() if name_tag else "N/A"
-                link_tag = item.find("a", href=True)
-                link = link_tag['href'] if link_tag else "N/A"
-                price_tag = item.select_one("span.lfloat.product-price")
-                price = parse_price(price_tag.text.strip() if price_tag else "N/A")
-                original_price_tag = item.select_one("span.lfloat.product-desc-price.strike")
-                discount = "N/A"
-                if original_price_tag:
-                    old_price = parse_price(original_price_tag.text.strip())
-                    if old_price != "N/A" and price != "N/A" and old_price > price:
-                        discount = f"{round(((old_price-price)/old_price)*100)}% off"
-                rating = "N/A"
-                for selector in [
-                    "span.rating-num", "div.rating-stars span", "span.rat-text",
-                    "div.product-rating span", "span.ratingText", "p.ratingText"
-                ]:
-                    rating_tag = item.select_one(selector)
-                    if rating_tag and rating_tag.text.strip():
-                        match = re.search(r'\d*\.?\d+', rating_tag.text.strip())
-                        if match:
-                            rating = match.group()
-                            break
-                if rating == "N/A":
-                    stars = item.select_one("span.filled-stars")
-                    if stars and "style" in stars.attrs:
-                        match = re.search(r'width:(\d+)%', stars["style"])
-                        if match:
-                            rating = str(round(int(match.group(1))/20, 1))
-                if name != "N/A" and price != "N/A":
-                    products.append(Product(name, price, discount, rating, link, "Snapdeal"))
-            except Exception:
-                continue
-    finally:
-        driver.quit()
-    return products[:max_results]
\ No newline at end of file
+def scrape_snapdeal_http(query, max_results=MAX_RESULTS_PER_SITE):
+    soup = fetch_soup(get_snapdeal_search_url(query), "Snapdeal", SNAPDEAL_CONTAINER)
+    return parse_snapdeal_products(soup, max_results)
+
+def scrape_snapdeal_browser(query, max_results=MAX_RESULTS_PER_SITE):
+    url = get_snapdeal_search_url(query)
+    logging.info(f"Scraping Snapdeal: {url}")
+    with pooled_driver("Snapdeal") as driver:
+        with timer("page_load", "Snapdeal"):
+            driver.get(url)
+            WebDriverWait(driver, 20).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "div.product-tuple-listing"))
+            )
+        return browse_products(driver, "Snapdeal", "div.product-tuple-listing", SNAPDEAL_FIELDS,
+                               parse_snapdeal_products, max_results)
+
+@timed("scrape", "Snapdeal")
+def scrape_snapdeal(query, max_results=MAX_RESULTS_PER_SITE):
+    return scrape_http_first("Snapdeal", scrape_snapdeal_http, scrape_snapdeal_browser, query, max_results)
@@ -0,0 +1,150 @@
+# modules/search.py
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+from modules.scrapers.amazon import scrape_amazon
+from modules.scrapers.myntra import scrape_myntra
+from modules.scrapers.snapdeal import scrape_snapdeal
+from modules.scrapers.shopclues import scrape_shopclues
+from modules.scrapers.flipkart import scrape_flipkart
+from modules.cache import cached_scrape
+from modules.profiling import tag_thread
+from config import (
+    MAX_RESULTS_PER_SITE, SEARCH_DEADLINE, HEDGE_REQUESTS, HEDGE_PERCENTILE, HEDGE_MIN_SAMPLES,
+    HEDGE_DEFAULT_P95, HEDGE_HISTORY
+)
+
+SCRAPERS = {
+    "Amazon": scrape_amazon,
+    "Myntra": scrape_myntra,
+    "Snapdeal": scrape_snapdeal,
+    "ShopClues": scrape_shopclues,
+    "Flipkart": scrape_flipkart
+}
+
+class SiteLatencyTracker:
+    def __init__(self, history=HEDGE_HISTORY):
+        self._samples = defaultdict(lambda: deque(maxlen=history))
+        self._lock = threading.Lock()
+
+    def record(self, site, seconds):
+        with self._lock:
+            self._samples[site].append(seconds)
+
+    def percentile(self, site, pct=HEDGE_PERCENTILE, min_samples=HEDGE_MIN_SAMPLES, default=HEDGE_DEFAULT_P95):
+        # Until a site has enough history (every fresh process), the configured default stands in.
+        with self._lock:
+            samples = sorted(self._samples[site])
+        if len(samples) < min_samples:
+            return default
+        return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+site_latencies = SiteLatencyTracker()
+
+def tagged_scrape(site, query, max_results):
+    # Only real scrapes feed the latency history; a cache hit would drag the p95 towards zero.
+    def scrape(query, max_results):
+        started = time.monotonic()
+        products = SCRAPERS[site](query, max_results)
+        site_latencies.record(site, time.monotonic() - started)
+        return products
+
+    with tag_thread(site):
+        return cached_scrape(site, scrape, query, max_results)
+
+def submit_daemon(site, fn, *args):
+    # Each attempt gets its own daemon thread, so one abandoned at the deadline or after a
+    # hedge wins never holds up process exit the way a ThreadPoolExecutor worker would.
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name=f"search-{site}", daemon=True).start()
+    return future
+
+class SearchResult:
+    def __init__(self, products, completed_sites, failed_sites, missing_sites, hedged_sites, elapsed, errors=None):
+        self.products = products
+        self.completed_sites = completed_sites
+        self.failed_sites = failed_sites
+        self.missing_sites = missing_sites
+        self.hedged_sites = hedged_sites
+        self.elapsed = elapsed
+        self.errors = errors or {}  # failed site -> error message
+
+    @property
+    def partial(self):
+        return bool(self.failed_sites or self.missing_sites)
+
+def search_all_sites(query, max_results=MAX_RESULTS_PER_SITE, on_site_done=None,
+                     deadline=SEARCH_DEADLINE, hedge=HEDGE_REQUESTS):
+    all_products = []
+    completed, failed, hedged = [], [], []
+    errors = {}
+    finished = set()
+    start = time.monotonic()
+    end = start + deadline if deadline else float("inf")
+    pending = {
+        submit_daemon(site, tagged_scrape, site, query, max_results): (site, start)
+        for site in SCRAPERS
+    }
+
+    def finish(site, products):
+        finished.add(site)
+        all_products.extend(products)
+        if on_site_done:
+            on_site_done(site, products)
+
+    while pending:
+        now = time.monotonic()
+        if now >= end:
+            break
+        timeout = end - now
+        if hedge:
+            for site, started in list(pending.values()):
+                if site in hedged:
+                    continue
+                p95 = site_latencies.percentile(site)
+                if p95 is None:
+                    continue
+                if now - started >= p95:
+                    logging.info(f"{site} exceeded its p{HEDGE_PERCENTILE} latency of {p95:.1f}s, sending a hedged request")
+                    hedged.append(site)
+                    future = submit_daemon(site, tagged_scrape, site, query, max_results)
+                    pending[future] = (site, now)
+                else:
+                    timeout = min(timeout, started + p95 - now)
+        # wait() cannot take an infinite timeout; None blocks until an attempt finishes.
+        done, _ = wait(pending, timeout=None if timeout == float("inf") else timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            site, _ = pending.pop(future)
+            if site in finished:
+                continue
+            try:
+                products = future.result()
+            except Exception as e:
+                if any(other == site for other, _ in pending.values()):
+                    logging.warning(f"{site} attempt failed ({e}), waiting on its other request")
+                    continue
+                logging.error(f"Error in {site}: {e}")
+                failed.append(site)
+                errors[site] = str(e)
+                finish(site, [])
+                continue
+            logging.info(f"{site}: {len(products)} products scraped")
+            completed.append(site)
+            finish(site, products)
+        # A losing attempt runs on in its daemon thread; its result is simply never read.
+        pending = {f: (site, started) for f, (site, started) in pending.items() if site not in finished}
+    missing = [site for site in SCRAPERS if site not in finished]
+    if missing:
+        logging.warning(f"Search deadline of {deadline}s passed, continuing without {', '.join(missing)}")
+    return SearchResult(all_products, completed, failed, missing, hedged, time.monotonic() - start, errors)
@@ -0,0 +1,75 @@
+# modules/selector_plan.py
+import threading
+from collections import defaultdict
+from functools import lru_cache
+import soupsieve
+from bs4 import Tag
+from config import SELECTOR_PLAN_LEARN_ITEMS
+
+_hit_stats = defaultdict(lambda: defaultdict(int))
+_hit_lock = threading.Lock()
+
+@lru_cache(maxsize=None)
+def compile_selector(selector):
+    return soupsieve.compile(selector)
+
+def select_one(item, selector):
+    if isinstance(item, Tag):
+        return compile_selector(selector).select_one(item)
+    return item.select_one(selector)  # selectolax nodes take the CSS string directly
+
+def has_text(tag):
+    return bool(tag.text.strip())
+
+class SelectorPlan:
+    # One field's fallback chain for one page. The first few items try every selector in order;
+    # after that the selector that matched most often is tried first, and the full chain
+    # is only walked again for items it misses.
+    def __init__(self, site, field, selectors, accept=None, learn_items=SELECTOR_PLAN_LEARN_ITEMS):
+        self.site = site
+        self.field = field
+        self.selectors = tuple(selectors)
+        self.accept = accept
+        self.learn_items = learn_items
+        self.wins = defaultdict(int)
+        self.seen = 0
+        self.pinned = None
+
+    def match(self, item, selector):
+        tag = select_one(item, selector)
+        return tag if tag is not None and (self.accept is None or self.accept(tag)) else None
+
+    def find(self, item):
+        self.seen += 1
+        if self.pinned is not None:
+            tag = self.match(item, self.pinned)
+            if tag is not None:
+                record_selector_hit(self.site, self.field, self.pinned)
+                return tag
+        for selector in self.selectors:
+            if selector == self.pinned:
+                continue
+            tag = self.match(item, selector)
+            if tag is not None:
+                self.wins[selector] += 1
+                record_selector_hit(self.site, self.field, selector)
+                break
+        else:
+            tag = None
+            record_selector_hit(self.site, self.field, None)
+        if self.pinned is None and self.seen >= self.learn_items and self.wins:
+            self.pinned = max(self.wins, key=self.wins.get)
+        return tag
+
+def record_selector_hit(site, field, selector):
+    with _hit_lock:
+        _hit_stats[(site, field)][selector or "miss"] += 1
+
+def get_selector_stats():
+    # Per (site, field), the share of items each selector served; "miss" counts items none matched.
+    with _hit_lock:
+        stats = {}
+        for key, counts in _hit_stats.items():
+            total = sum(counts.values())
+            stats[key] = {selector: hits / total for selector, hits in counts.items()}
+        return stats
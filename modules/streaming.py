@@ -0,0 +1,53 @@
+# modules/streaming.py
+import heapq
+import itertools
+import math
+from modules.sorting import compute_rating_price_score
+from config import MAX_RESULTS_PER_SITE
+
+class LiveTopK:
+    # Rated products have a fixed score, so only the best k are kept. Unrated products all get the
+    # same imputed average, which makes the cheapest ones score best, so only the k cheapest are kept.
+    # Re-ranking the two small heaps with the current average reproduces impute-then-rank exactly.
+    def __init__(self, k=MAX_RESULTS_PER_SITE):
+        self.k = k
+        self.products = []
+        self.valid_count = 0
+        self._rated = []
+        self._unrated = []
+        self._rating_sum = 0.0
+        self._rating_count = 0
+        self._seq = itertools.count()
+
+    def add(self, products):
+        for product in products:
+            self.products.append(product)
+            if product.rating_value > 0:
+                self._rating_sum += product.rating_value
+                self._rating_count += 1
+            if not product.is_valid:
+                continue
+            self.valid_count += 1
+            if product.rating_value > 0:
+                entry = (compute_rating_price_score(product), -next(self._seq), product)
+                heap = self._rated
+            else:
+                entry = (-product.price, -next(self._seq), product)
+                heap = self._unrated
+            if len(heap) < self.k:
+                heapq.heappush(heap, entry)
+            else:
+                heapq.heappushpop(heap, entry)
+
+    @property
+    def average_rating(self):
+        avg = self._rating_sum / self._rating_count if self._rating_count else 4.0
+        return float(f"{avg:.1f}")  # impute_na_ratings stores the average rounded like this
+
+    def ranking(self):
+        avg = self.average_rating
+        candidates = [(score, seq, product) for score, seq, product in self._rated]
+        for neg_price, seq, product in self._unrated:
+            candidates.append(((avg ** 2) / math.log10(max(-neg_price, 1)), seq, product))
+        candidates.sort(key=lambda c: (c[0], c[1]), reverse=True)
+        return [(score, product) for score, _, product in candidates[:self.k]]
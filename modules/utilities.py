@@ -3,6 +3,7 @@ import logging
 import random
 import time
 import re
+from functools import lru_cache
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -10,13 +11,21 @@ from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
-from bs4 import BeautifulSoup
-from config import LOGGING_CONFIG, USER_AGENTS, SCROLL_COUNT, SCROLL_PAUSE, get_random_user_agent
+from modules.parsing import make_soup
+from modules.metrics import timer
+from config import (
+    LOGGING_CONFIG, USER_AGENTS, SCROLL_COUNT, SCROLL_PAUSE, SCROLL_MODE, SCROLL_DEADLINE,
+    SCROLL_POLL_INTERVAL, SCROLL_STABLE_POLLS, get_random_user_agent
+)
 
 # Logging setup
 logging.basicConfig(**LOGGING_CONFIG)
 
-def setup_driver():
+@lru_cache(maxsize=1)
+def get_chromedriver_path():
+    return ChromeDriverManager().install()
+
+def setup_driver(user_agent=None, site="all"):
     options = Options()
     options.add_argument('--headless=new')
     options.add_argument('--disable-gpu')
@@ -24,17 +33,54 @@ def setup_driver():
     options.add_argument('--disable-dev-shm-usage')
     options.add_argument('--window-size=1920,1080')
     options.add_argument('--log-level=3')
-    options.add_argument(f'--user-agent={get_random_user_agent()}')
+    options.add_argument(f'--user-agent={user_agent or get_random_user_agent()}')
     options.add_argument('--disable-blink-features=AutomationControlled')
     options.add_experimental_option("excludeSwitches", ["enable-logging", "enable-automation"])
     options.add_experimental_option('useAutomationExtension', False)
-    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    with timer("driver_startup", site):
+        return webdriver.Chrome(service=Service(get_chromedriver_path()), options=options)
+
+COUNT_AND_HEIGHT_JS = "return [document.querySelectorAll(arguments[0]).length, document.body.scrollHeight];"
+CONTAINERS_HTML_JS = "return Array.from(document.querySelectorAll(arguments[0]), e => e.outerHTML).join('');"
 
-def smart_scroll(driver, scroll_count=SCROLL_COUNT, pause=SCROLL_PAUSE):
-    for _ in range(scroll_count):
+def adaptive_scroll(driver, target_selector, target_count, deadline=SCROLL_DEADLINE,
+                    poll_interval=SCROLL_POLL_INTERVAL, stable_polls=SCROLL_STABLE_POLLS):
+    end = time.monotonic() + deadline
+    last_state = None
+    unchanged = 0
+    count = 0
+    while time.monotonic() < end:
         driver.execute_script("window.scrollBy(0, document.body.scrollHeight);")
-        time.sleep(pause + random.uniform(0.5, 1.5))
-    return BeautifulSoup(driver.execute_script("return document.body.innerHTML"), "html.parser")
+        time.sleep(poll_interval)
+        count, height = driver.execute_script(COUNT_AND_HEIGHT_JS, target_selector)
+        if count >= target_count:
+            logging.info(f"Found {count} '{target_selector}' elements, stopping scroll")
+            return count
+        if (count, height) == last_state:
+            unchanged += 1
+            if unchanged >= stable_polls:
+                logging.info(f"DOM stopped growing at {count} '{target_selector}' elements")
+                return count
+        else:
+            unchanged = 0
+            last_state = (count, height)
+    logging.warning(f"Scroll deadline of {deadline}s reached with {count} '{target_selector}' elements")
+    return count
+
+def scroll_page(driver, scroll_count=SCROLL_COUNT, pause=SCROLL_PAUSE,
+                target_selector=None, target_count=None, deadline=SCROLL_DEADLINE):
+    if SCROLL_MODE == "adaptive" and target_selector and target_count:
+        adaptive_scroll(driver, target_selector, target_count, deadline)
+    else:
+        for _ in range(scroll_count):
+            driver.execute_script("window.scrollBy(0, document.body.scrollHeight);")
+            time.sleep(pause + random.uniform(0.5, 1.5))
+
+def get_page_soup(driver, target_selector=None, site="all"):
+    if target_selector:
+        # Only the product containers cross the WebDriver bridge and get parsed.
+        return make_soup(driver.execute_script(CONTAINERS_HTML_JS, target_selector), site=site)
+    return make_soup(driver.execute_script("return document.body.innerHTML"), site=site)
 
 def parse_price(price_str):
     if not price_str or price_str == "N/A":